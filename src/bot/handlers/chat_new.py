@@ -20,9 +20,10 @@ from beartype import beartype
 from src.ai.ollama_client import OllamaClient
 from src.ai.prompts import create_stage_specific_prompt
 from src.database.context import ConversationContext
+from src.funnel.repository import FunnelContextRepository
 from src.funnel.router import FunnelRouter
 from src.funnel.stages import FunnelContext, FunnelStage
-from src.handoff.escalation_rules import EscalationRules
+from src.handoff.escalation_rules import get_escalation_message, should_escalate
 from src.handoff.ticket_manager import TicketManager
 from src.knowledge.faq_loader import KnowledgeBase
 from src.knowledge.search import quick_faq_check
@@ -34,8 +35,31 @@ from src.database.context import Message as ContextMessage
 
 router = Router()
 
-# Глобальное хранилище контекстов воронки (в production - в БД)
+# Кэш контекстов воронки в памяти, персистентность - через репозиторий
 _funnel_contexts: dict[int, FunnelContext] = {}
+_funnel_repository: FunnelContextRepository | None = None
+_funnel_router: FunnelRouter | None = None
+
+
+def _get_funnel_repository(context: ConversationContext) -> FunnelContextRepository:
+    """Получить (и при первом вызове запустить) репозиторий контекстов воронки."""
+    global _funnel_repository
+    if _funnel_repository is None:
+        _funnel_repository = FunnelContextRepository(context.db_path)
+        _funnel_repository.start()
+    return _funnel_repository
+
+
+def _get_funnel_router(
+    knowledge_base: KnowledgeBase, context: ConversationContext
+) -> FunnelRouter:
+    """Получить общий router воронки (сохраняет кэш ответов между сообщениями)."""
+    global _funnel_router
+    if _funnel_router is None or _funnel_router.knowledge_base is not knowledge_base:
+        _funnel_router = FunnelRouter(
+            knowledge_base, SlotExtractor(), _get_funnel_repository(context)
+        )
+    return _funnel_router
 
 
 @router.message(F.text)
@@ -45,6 +69,7 @@ async def handle_text_message(
     knowledge_base: KnowledgeBase,
     context: ConversationContext,
     ollama_client: OllamaClient,
+    ticket_manager: TicketManager,
 ) -> None:
     """Обработать текстовое сообщение с полной интеграцией стандарта.
 
@@ -53,6 +78,7 @@ async def handle_text_message(
         knowledge_base: База знаний
         context: Менеджер контекста диалогов
         ollama_client: Клиент Ollama для AI
+        ticket_manager: Менеджер тикетов (общий, из middleware)
     """
     if not message.from_user or not message.text:
         return
@@ -64,9 +90,9 @@ async def handle_text_message(
     # Инициализировать зависимости
     intent_classifier = IntentClassifier()
     slot_extractor = SlotExtractor()
-    funnel_router = FunnelRouter(knowledge_base, slot_extractor)
+    funnel_repository = _get_funnel_repository(context)
+    funnel_router = _get_funnel_router(knowledge_base, context)
     event_logger = EventLogger(context.db_path)
-    ticket_manager = TicketManager(context.db_path)
 
     # Записать событие начала диалога
     await event_logger.log_conversation_started(user_id)
@@ -82,11 +108,9 @@ async def handle_text_message(
     await event_logger.log_intent_classified(user_id, intent.name, intent.confidence)
 
     # ===== ШАГ 2: Проверка на необходимость handoff =====
-    should_escalate, escalation_reason = EscalationRules.should_escalate(
-        intent, intent.confidence
-    )
+    escalate, escalation_reason = should_escalate(intent, intent.confidence)
 
-    if should_escalate:
+    if escalate:
         # Немедленная эскалация для супер-приоритетных интентов
         await handle_escalation(
             message,
@@ -118,10 +142,14 @@ async def handle_text_message(
     # ===== ШАГ 4: Извлечение слотов =====
     # Получить или создать контекст воронки
     if user_id not in _funnel_contexts:
-        slots = SlotCollection()
-        _funnel_contexts[user_id] = FunnelContext(
-            user_id=user_id, current_stage=FunnelStage.ACQUISITION, slots=slots
-        )
+        stored_context = await funnel_repository.load(user_id)
+        if stored_context is None:
+            stored_context = FunnelContext(
+                user_id=user_id,
+                current_stage=FunnelStage.ACQUISITION,
+                slots=SlotCollection(),
+            )
+        _funnel_contexts[user_id] = stored_context
 
     funnel_context = _funnel_contexts[user_id]
 
@@ -223,7 +251,7 @@ async def handle_escalation(
     )
 
     # Сообщение пользователю
-    escalation_message = EscalationRules.get_escalation_message(intent)
+    escalation_message = get_escalation_message(intent)
     await message.answer(escalation_message, parse_mode=None)
 
 
@@ -0,0 +1,54 @@
+"""Общие долгоживущие соединения с SQLite.
+
+Одно соединение на файл БД на весь процесс: не тратим время на открытие
+файла и разбор схемы при каждом запросе, а страничный кэш SQLite
+остаётся тёплым между запросами.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import aiosqlite
+from beartype import beartype
+
+_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-64000;
+"""
+
+_connections: dict[Path, aiosqlite.Connection] = {}
+_connect_lock = asyncio.Lock()
+
+
+@beartype
+async def get_connection(db_path: Path) -> aiosqlite.Connection:
+    """Получить общее соединение с БД (создаётся при первом обращении).
+
+    Args:
+        db_path: Путь к файлу базы данных
+
+    Returns:
+        aiosqlite.Connection: Открытое соединение с применёнными PRAGMA
+    """
+    db = _connections.get(db_path)
+    if db is not None:
+        return db
+
+    async with _connect_lock:
+        db = _connections.get(db_path)
+        if db is None:
+            db = await aiosqlite.connect(db_path)
+            await db.executescript(_PRAGMAS)
+            _connections[db_path] = db
+    return db
+
+
+async def close_connections() -> None:
+    """Закрыть все общие соединения (при остановке бота)."""
+    while _connections:
+        _, db = _connections.popitem()
+        await db.close()
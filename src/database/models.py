@@ -84,6 +84,18 @@ async def init_database(db_path: Path) -> None:
             )
         """)
 
+        # Типизированная колонка для FRT: вычисляется SQLite из event_data,
+        # поэтому запросы метрик читают число из индекса без разбора JSON.
+        # ALTER, а не CREATE TABLE - чтобы колонка появилась и в существующих БД
+        event_columns = {
+            row[1] for row in await db.execute_fetchall("PRAGMA table_xinfo(events)")
+        }
+        if "response_time_ms" not in event_columns:
+            await db.execute("""
+                ALTER TABLE events ADD COLUMN response_time_ms REAL
+                GENERATED ALWAYS AS (json_extract(event_data, '$.response_time_ms')) VIRTUAL
+            """)
+
         # Таблица слотов (для отслеживания собранных параметров)
         await db.execute("""
             CREATE TABLE IF NOT EXISTS slots (
@@ -96,6 +108,27 @@ async def init_database(db_path: Path) -> None:
             )
         """)
 
+        # Таблица контекстов воронки (этап + слоты пользователя)
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS funnel_contexts (
+                user_id INTEGER PRIMARY KEY,
+                current_stage TEXT NOT NULL,
+                state_json TEXT NOT NULL,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users(user_id)
+            )
+        """)
+
+        # Предрассчитанные недельные метрики (обновляются фоновой задачей)
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS metrics_weekly (
+                week_key TEXT PRIMARY KEY,
+                frt_p50 REAL NOT NULL,
+                containment REAL NOT NULL,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
         # Таблица согласий (для GDPR compliance)
         await db.execute("""
             CREATE TABLE IF NOT EXISTS user_consents (
@@ -117,8 +150,20 @@ async def init_database(db_path: Path) -> None:
             CREATE INDEX IF NOT EXISTS idx_events_user_id ON events(user_id)
         """)
 
+        # Метрики фильтруют события по типу и периоду; user_id в конце индекса
+        # позволяет считать COUNT(DISTINCT user_id) без обращения к таблице
+        await db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_events_type_ts_user
+            ON events(event_type, timestamp, user_id)
+        """)
+
+        # Прежние индексы являются префиксами нового и только замедляют вставки
+        await db.execute("DROP INDEX IF EXISTS idx_events_type")
+        await db.execute("DROP INDEX IF EXISTS idx_events_type_ts")
+
         await db.execute("""
-            CREATE INDEX IF NOT EXISTS idx_events_type ON events(event_type)
+            CREATE INDEX IF NOT EXISTS idx_events_type_ts_frt
+            ON events(event_type, timestamp, response_time_ms)
         """)
 
         await db.execute("""
@@ -19,6 +19,11 @@ if TYPE_CHECKING:
     from src.nlu.intent_classifier import Intent
 
 
+# Члены FunnelStage для горячего пути process (поиск глобального имени)
+_OFFER = FunnelStage.OFFER
+_CLOSING = FunnelStage.CLOSING
+
+
 class OfferStage(BaseFunnelStage):
     """Этап оффера - формирование предложения."""
 
@@ -57,7 +62,7 @@ class OfferStage(BaseFunnelStage):
                 stage=self.stage_name,
                 success=True,
                 response_text="Отлично! Оформляем заказ.",
-                next_stage=FunnelStage.CLOSING,
+                next_stage=_CLOSING,
             )
 
         # Сформировать оффер на основе собранных слотов
@@ -67,7 +72,7 @@ class OfferStage(BaseFunnelStage):
             stage=self.stage_name,
             success=True,
             response_text=offer_text,
-            next_stage=FunnelStage.OFFER,  # Ждём подтверждения
+            next_stage=_OFFER,  # Ждём подтверждения
         )
 
     @beartype
@@ -19,11 +19,27 @@ if TYPE_CHECKING:
     from src.nlu.intent_classifier import Intent
 
 
+_SUMMARY_TEMPLATE = (
+    "Понял:\n"
+    "• Задача: {goal}\n"
+    "• Бюджет: {budget_band}\n"
+    "• Срок: {deadline}\n\n"
+    "Сейчас подберу варианты..."
+).format_map
+
+
+# Члены FunnelStage для горячего пути process (поиск глобального имени)
+_QUALIFICATION = FunnelStage.QUALIFICATION
+_OFFER = FunnelStage.OFFER
+
+
 class QualificationStage(BaseFunnelStage):
     """Этап квалификации - сбор параметров."""
 
     stage_name = FunnelStage.QUALIFICATION
 
+    REQUIRED_SLOTS = ("goal", "budget_band", "deadline")
+
     @beartype
     def __init__(
         self, knowledge_base: KnowledgeBase, slot_extractor: SlotExtractor
@@ -40,7 +56,7 @@ class QualificationStage(BaseFunnelStage):
     @beartype
     def get_required_slots(self) -> list[str]:
         """Обязательные слоты для квалификации."""
-        return ["goal", "budget_band", "deadline"]
+        return list(self.REQUIRED_SLOTS)
 
     @beartype
     def get_exit_criteria(self) -> dict[str, str]:
@@ -72,16 +88,15 @@ class QualificationStage(BaseFunnelStage):
         # Проверить завершён ли этап
         if self.is_complete(slots):
             # Квалификация завершена - переходим к офферу
-            summary = self._create_summary(slots)
+            collected = {
+                name: slots.get_value(name) or "" for name in self.REQUIRED_SLOTS
+            }
             return StageResult(
                 stage=self.stage_name,
                 success=True,
-                response_text=summary,
-                next_stage=FunnelStage.OFFER,
-                collected_slots={
-                    name: slots.get_value(name) or ""
-                    for name in self.get_required_slots()
-                },
+                response_text=self._create_summary(collected),
+                next_stage=_OFFER,
+                collected_slots=collected,
             )
 
         # Запросить недостающие слоты
@@ -90,22 +105,14 @@ class QualificationStage(BaseFunnelStage):
             stage=self.stage_name,
             success=False,  # Не завершён
             response_text=question,
-            next_stage=FunnelStage.QUALIFICATION,  # Остаёмся
+            next_stage=_QUALIFICATION,  # Остаёмся
         )
 
     @beartype
-    def _create_summary(self, slots: SlotCollection) -> str:
+    def _create_summary(self, values: dict[str, str]) -> str:
         """Создать резюме собранных параметров."""
-        goal = slots.get_value("goal") or "не указано"
-        budget = slots.get_value("budget_band") or "не указано"
-        deadline = slots.get_value("deadline") or "не указано"
-
-        return (
-            f"Понял:\n"
-            f"• Задача: {goal}\n"
-            f"• Бюджет: {budget}\n"
-            f"• Срок: {deadline}\n\n"
-            f"Сейчас подберу варианты..."
+        return _SUMMARY_TEMPLATE(
+            {name: value or "не указано" for name, value in values.items()}
         )
 
     @beartype
@@ -0,0 +1,192 @@
+"""Хранение контекстов воронки в SQLite с отложенной записью.
+
+Переходы между этапами только помечают контекст как изменённый,
+а фоновая задача раз в FLUSH_INTERVAL секунд записывает все изменённые
+контексты одной транзакцией.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from pathlib import Path
+
+from beartype import beartype
+
+from src.database.connection import get_connection
+from src.funnel.stages import FunnelContext, FunnelStage
+from src.nlu.slot_extractor import SlotCollection, SlotValue
+
+logger = logging.getLogger(__name__)
+
+# Энкодер создаётся один раз вместо нового JSONEncoder в каждом json.dumps
+_encode_state = json.JSONEncoder(ensure_ascii=False).encode
+
+# Запущенные репозитории: при остановке бота их изменения дописываются в БД
+_started_repositories: set[FunnelContextRepository] = set()
+
+
+class FunnelContextRepository:
+    """Репозиторий контекстов воронки с write-back очередью."""
+
+    FLUSH_INTERVAL = 0.2  # секунды
+
+    @beartype
+    def __init__(self, db_path: Path, flush_interval: float = FLUSH_INTERVAL) -> None:
+        """Инициализация.
+
+        Args:
+            db_path: Путь к БД
+            flush_interval: Период сброса изменённых контекстов в секундах
+        """
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self._dirty: dict[int, FunnelContext] = {}
+        # Пачка, которая пишется прямо сейчас: load() читает её до коммита
+        self._in_flight: dict[int, FunnelContext] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task[None] | None = None
+
+    @beartype
+    def mark_dirty(self, user_id: int, funnel_context: FunnelContext) -> None:
+        """Пометить контекст пользователя для записи в БД.
+
+        Повторные изменения до следующего сброса схлопываются в одну запись.
+
+        Args:
+            user_id: ID пользователя
+            funnel_context: Контекст воронки
+        """
+        self._dirty[user_id] = funnel_context
+
+    def start(self) -> None:
+        """Запустить фоновую задачу сброса изменений."""
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+            _started_repositories.add(self)
+
+    async def close(self) -> None:
+        """Остановить фоновую задачу и записать оставшиеся изменения."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        _started_repositories.discard(self)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Записать все изменённые контексты одной транзакцией.
+
+        Если запись не удалась, пачка возвращается в очередь изменений
+        (более новые изменения тех же пользователей не перезаписываются).
+        """
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+
+            batch, self._dirty = self._dirty, {}
+            self._in_flight = batch
+            try:
+                rows = [
+                    (user_id, ctx.current_stage.value, _serialize(ctx))
+                    for user_id, ctx in batch.items()
+                ]
+
+                db = await get_connection(self.db_path)
+                await db.executemany(
+                    """
+                    INSERT OR REPLACE INTO funnel_contexts (user_id, current_stage, state_json)
+                    VALUES (?, ?, ?)
+                    """,
+                    rows,
+                )
+                await db.commit()
+            except BaseException:
+                self._dirty = batch | self._dirty
+                raise
+            finally:
+                self._in_flight = {}
+
+    @beartype
+    async def load(self, user_id: int) -> FunnelContext | None:
+        """Загрузить контекст воронки пользователя.
+
+        Args:
+            user_id: ID пользователя
+
+        Returns:
+            FunnelContext | None: Контекст или None если не сохранён
+        """
+        pending = self._dirty.get(user_id) or self._in_flight.get(user_id)
+        if pending is not None:
+            return pending
+
+        db = await get_connection(self.db_path)
+        rows = await db.execute_fetchall(
+            "SELECT current_stage, state_json FROM funnel_contexts WHERE user_id = ?",
+            (user_id,),
+        )
+
+        row = next(iter(rows), None)
+        if row is None:
+            return None
+
+        return _deserialize(user_id, FunnelStage(row[0]), row[1])
+
+    async def _flush_loop(self) -> None:
+        """Периодически сбрасывать изменённые контексты в БД."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing funnel contexts: {e}")
+
+
+async def close_funnel_repositories() -> None:
+    """Записать изменения всех запущенных репозиториев (при остановке бота)."""
+    while _started_repositories:
+        await _started_repositories.pop().close()
+
+
+def _serialize(funnel_context: FunnelContext) -> str:
+    """Сериализовать состояние контекста (без user_id и этапа) в JSON."""
+    return _encode_state(
+        {
+            "slots": {
+                name: [slot.value, slot.confidence, slot.extracted_from]
+                for name, slot in funnel_context.slots.slots.items()
+            },
+            "required_slots": funnel_context.slots.required_slots,
+            "stage_entry_count": {
+                stage.value: count
+                for stage, count in funnel_context.stage_entry_count.items()
+            },
+            "last_stage_change": funnel_context.last_stage_change,
+        }
+    )
+
+
+def _deserialize(user_id: int, current_stage: FunnelStage, state_json: str) -> FunnelContext:
+    """Восстановить контекст воронки из JSON."""
+    state = json.loads(state_json)
+    slots = SlotCollection(
+        slots={
+            name: SlotValue(
+                name=name, value=value, confidence=confidence, extracted_from=source
+            )
+            for name, (value, confidence, source) in state["slots"].items()
+        },
+        required_slots=state["required_slots"],
+    )
+    return FunnelContext(
+        user_id=user_id,
+        current_stage=current_stage,
+        slots=slots,
+        stage_entry_count={
+            FunnelStage(stage): count
+            for stage, count in state["stage_entry_count"].items()
+        },
+        last_stage_change=state["last_stage_change"],
+    )
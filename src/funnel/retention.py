@@ -23,6 +23,17 @@ class RetentionStage(BaseFunnelStage):
 
     stage_name = FunnelStage.RETENTION
 
+    # Ответ не зависит от ввода - создаём его один раз
+    _DONE_RESULT = StageResult(
+        stage=FunnelStage.RETENTION,
+        success=True,
+        response_text=(
+            "Рад что получилось! "
+            "Если понадобится что-то ещё — обращайтесь."
+        ),
+        next_stage=None,
+    )
+
     @beartype
     def __init__(self, knowledge_base: KnowledgeBase) -> None:
         """Инициализация."""
@@ -38,14 +49,4 @@ class RetentionStage(BaseFunnelStage):
     ) -> StageResult:
         """Обработать возможность upsell."""
         # Предлагаем дополнительные услуги только если основной вопрос решён
-        response = (
-            "Рад что получилось! "
-            "Если понадобится что-то ещё — обращайтесь."
-        )
-
-        return StageResult(
-            stage=self.stage_name,
-            success=True,
-            response_text=response,
-            next_stage=None,
-        )
+        return self._DONE_RESULT
@@ -11,6 +11,7 @@ from src.funnel.closing import ClosingStage
 from src.funnel.complaints import ComplaintsStage
 from src.funnel.offer import OfferStage
 from src.funnel.qualification import QualificationStage
+from src.funnel.repository import FunnelContextRepository
 from src.funnel.retention import RetentionStage
 from src.funnel.stages import FunnelContext, FunnelStage, StageResult
 from src.funnel.support import SupportStage
@@ -21,22 +22,52 @@ if TYPE_CHECKING:
     from src.database.context import Message
     from src.nlu.intent_classifier import Intent
 
+# Члены FunnelStage, привязанные на уровне модуля: в горячих путях это
+# один поиск глобального имени вместо обращения к атрибуту enum
+_ACQUISITION = FunnelStage.ACQUISITION
+_QUALIFICATION = FunnelStage.QUALIFICATION
+_OFFER = FunnelStage.OFFER
+_CLOSING = FunnelStage.CLOSING
+_SUPPORT = FunnelStage.SUPPORT
+_COMPLAINTS = FunnelStage.COMPLAINTS
+
 
 class FunnelRouter:
     """Маршрутизатор между этапами воронки."""
 
+    # Сколько последних сообщений истории передаётся в этапы
+    MAX_HISTORY_MESSAGES = 20
+
+    # Этапы без побочных эффектов на слоты: их ответ зависит только от
+    # сообщения, интента и уже собранных слотов, поэтому его можно кэшировать
+    CACHEABLE_STAGES = frozenset(
+        {
+            FunnelStage.ACQUISITION,
+            FunnelStage.OFFER,
+            FunnelStage.SUPPORT,
+            FunnelStage.RETENTION,
+        }
+    )
+    RESPONSE_CACHE_SIZE = 1024
+
     @beartype
     def __init__(
-        self, knowledge_base: KnowledgeBase, slot_extractor: SlotExtractor
+        self,
+        knowledge_base: KnowledgeBase,
+        slot_extractor: SlotExtractor,
+        repository: FunnelContextRepository | None = None,
     ) -> None:
         """Инициализация router.
 
         Args:
             knowledge_base: База знаний
             slot_extractor: Экстрактор слотов
+            repository: Хранилище контекстов воронки (опционально)
         """
         self.knowledge_base = knowledge_base
         self.slot_extractor = slot_extractor
+        self.repository = repository
+        self._response_cache: dict[tuple[object, ...], StageResult] = {}
 
         # Создаём все этапы
         self.stages = {
@@ -73,27 +104,59 @@ class FunnelRouter:
         # Определить текущий этап
         current_stage = self._determine_stage_by_intent(intent, funnel_context)
 
-        # Обновить контекст если этап изменился
-        if current_stage != funnel_context.current_stage:
-            funnel_context.move_to_stage(current_stage)
+        # Обновить контекст (повторный вход в этап игнорируется в move_to_stage)
+        funnel_context.move_to_stage(current_stage)
 
         # Получить обработчик этапа
         stage_handler = self.stages.get(current_stage)
         if not stage_handler:
             # Fallback на acquisition
-            stage_handler = self.stages[FunnelStage.ACQUISITION]
-
-        # Обработать сообщение на текущем этапе
-        result = await stage_handler.process(
-            user_message, intent, funnel_context.slots, conversation_history
-        )
+            stage_handler = self.stages[_ACQUISITION]
+
+        # Этапам (и извлечению слотов) нужна только свежая часть истории
+        if len(conversation_history) > self.MAX_HISTORY_MESSAGES:
+            conversation_history = conversation_history[-self.MAX_HISTORY_MESSAGES:]
+
+        # Повторные запросы к этапам без побочных эффектов берём из кэша
+        cache_key: tuple[object, ...] | None = None
+        result: StageResult | None = None
+        if current_stage in self.CACHEABLE_STAGES:
+            cache_key = (
+                current_stage,
+                intent.name,
+                intent.group,
+                user_message,
+                tuple(
+                    (name, slot.value)
+                    for name, slot in funnel_context.slots.slots.items()
+                ),
+            )
+            result = self._response_cache.get(cache_key)
+
+        if result is None:
+            # Обработать сообщение на текущем этапе
+            result = await stage_handler.process(
+                user_message, intent, funnel_context.slots, conversation_history
+            )
+            if cache_key is not None and result.success and not result.requires_handoff:
+                self._cache_result(cache_key, result)
 
         # Если есть переход на следующий этап - обновить контекст
-        if result.next_stage and result.next_stage != current_stage:
+        if result.next_stage:
             funnel_context.move_to_stage(result.next_stage)
 
+        # Сохранение в БД выполняется пакетно фоновой задачей репозитория
+        if self.repository is not None:
+            self.repository.mark_dirty(funnel_context.user_id, funnel_context)
+
         return result
 
+    def _cache_result(self, cache_key: tuple[object, ...], result: StageResult) -> None:
+        """Сохранить результат этапа в кэш, вытесняя самую старую запись."""
+        if len(self._response_cache) >= self.RESPONSE_CACHE_SIZE:
+            del self._response_cache[next(iter(self._response_cache))]
+        self._response_cache[cache_key] = result
+
     @beartype
     def _determine_stage_by_intent(
         self, intent: Intent, funnel_context: FunnelContext
@@ -111,35 +174,35 @@ class FunnelRouter:
 
         # Претензии
         if intent.group == "complaints":
-            return FunnelStage.COMPLAINTS
+            return _COMPLAINTS
 
         # Privacy/данные обрабатываются через handoff, но формально это support
         if intent.group == "privacy":
-            return FunnelStage.SUPPORT  # Будет handoff
+            return _SUPPORT  # Будет handoff
 
         # Поддержка
         if intent.group == "support":
-            return FunnelStage.SUPPORT
+            return _SUPPORT
 
         # Транзакции
         if intent.group == "transactions":
             # Если уже есть слоты - переходим к closing
             if funnel_context.slots.get_value("goal"):
-                return FunnelStage.CLOSING
+                return _CLOSING
             else:
-                return FunnelStage.QUALIFICATION
+                return _QUALIFICATION
 
         # Предпродажа
         if intent.group == "presales":
             # Если нет слотов - квалификация
             if not funnel_context.slots.get_value("goal"):
-                return FunnelStage.QUALIFICATION
+                return _QUALIFICATION
             else:
                 # Уже есть данные - оффер
-                return FunnelStage.OFFER
+                return _OFFER
 
         # По умолчанию - текущий этап или acquisition
         if funnel_context.current_stage:
             return funnel_context.current_stage
 
-        return FunnelStage.ACQUISITION
+        return _ACQUISITION
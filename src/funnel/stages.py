@@ -12,8 +12,10 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from enum import Enum
+from types import MappingProxyType
 from typing import TYPE_CHECKING
 
 from beartype import beartype
@@ -34,9 +36,17 @@ class FunnelStage(str, Enum):
     RETENTION = "retention"  # Повторные продажи
 
 
-@dataclass
+# Общее пустое значение для словарных полей StageResult
+_EMPTY_MAPPING: Mapping[str, str] = MappingProxyType({})
+
+
+@dataclass(slots=True, frozen=True)
 class StageResult:
-    """Результат обработки этапа воронки."""
+    """Результат обработки этапа воронки.
+
+    Результаты кэшируются и отдаются разным вызывающим, поэтому словарные
+    поля при создании копируются в MappingProxyType и не могут быть изменены.
+    """
 
     stage: FunnelStage
     success: bool
@@ -44,8 +54,18 @@ class StageResult:
     next_stage: FunnelStage | None = None
     requires_handoff: bool = False
     handoff_reason: str | None = None
-    collected_slots: dict[str, str] = field(default_factory=dict)
-    metadata: dict[str, str] = field(default_factory=dict)
+    collected_slots: Mapping[str, str] = field(default_factory=lambda: _EMPTY_MAPPING)
+    metadata: Mapping[str, str] = field(default_factory=lambda: _EMPTY_MAPPING)
+
+    def __post_init__(self) -> None:
+        """Заморозить словарные поля."""
+        # Датакласс заморожен - поля заменяются через object.__setattr__
+        if not isinstance(self.collected_slots, MappingProxyType):
+            object.__setattr__(
+                self, "collected_slots", MappingProxyType(dict(self.collected_slots))
+            )
+        if not isinstance(self.metadata, MappingProxyType):
+            object.__setattr__(self, "metadata", MappingProxyType(dict(self.metadata)))
 
 
 class BaseFunnelStage:
@@ -112,7 +132,7 @@ class BaseFunnelStage:
         return None
 
 
-@dataclass
+@dataclass(slots=True)
 class FunnelContext:
     """Контекст текущего состояния воронки для пользователя."""
 
@@ -129,6 +149,10 @@ class FunnelContext:
         Args:
             new_stage: Новый этап
         """
+        # Повторный вход в текущий этап не считается переходом
+        if new_stage == self.current_stage:
+            return
+
         from datetime import datetime
 
         self.current_stage = new_stage
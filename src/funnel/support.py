@@ -23,6 +23,14 @@ class SupportStage(BaseFunnelStage):
 
     stage_name = FunnelStage.SUPPORT
 
+    # Ответ без номера заказа не зависит от ввода - создаём его один раз
+    _NO_ORDER_RESULT = StageResult(
+        stage=FunnelStage.SUPPORT,
+        success=True,
+        response_text="Напишите номер заказа для проверки статуса.",
+        next_stage=None,
+    )
+
     @beartype
     def __init__(self, knowledge_base: KnowledgeBase) -> None:
         """Инициализация."""
@@ -40,14 +48,12 @@ class SupportStage(BaseFunnelStage):
         # Простая логика: если есть order_id - проверяем статус
         order_id = slots.get_value("order_id")
 
-        if order_id:
-            response = f"Проверяю заказ №{order_id}. Свяжитесь с поддержкой для актуального статуса."
-        else:
-            response = "Напишите номер заказа для проверки статуса."
+        if not order_id:
+            return self._NO_ORDER_RESULT
 
         return StageResult(
             stage=self.stage_name,
             success=True,
-            response_text=response,
+            response_text=f"Проверяю заказ №{order_id}. Свяжитесь с поддержкой для актуального статуса.",
             next_stage=None,
         )
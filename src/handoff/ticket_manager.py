@@ -5,12 +5,16 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
-from dataclasses import asdict, dataclass
+import logging
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import aiosqlite
 from beartype import beartype
@@ -19,6 +23,30 @@ if TYPE_CHECKING:
     from src.database.context import Message
     from src.nlu.slot_extractor import SlotCollection
 
+logger = logging.getLogger(__name__)
+
+_SELECT_TICKET_SQL = """
+    SELECT
+        id, user_id, ticket_type, priority, summary,
+        context_json, requested_action, sla_deadline_at,
+        status, created_at
+    FROM tickets
+    WHERE id = ?
+"""
+
+# Энкодеры создаются один раз: json.dumps с нестандартными параметрами
+# конструирует новый JSONEncoder на каждый вызов
+_encode_context = json.JSONEncoder(ensure_ascii=False).encode
+_encode_export = json.JSONEncoder(ensure_ascii=False, indent=2).encode
+
+_INSERT_TICKET_SQL = """
+    INSERT INTO tickets (
+        user_id, ticket_type, priority, summary,
+        context_json, requested_action, sla_deadline_at,
+        status, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 
 class TicketType(str, Enum):
     """Типы тикетов."""
@@ -38,7 +66,33 @@ class Priority(str, Enum):
     P3 = "P3"  # Нормальный (sales lead)
 
 
-@dataclass
+# Справочники тикетов (приватные хелперы TicketManager вызываются только
+# из create_ticket, где типы уже проверены beartype)
+_PRIORITY_BY_TYPE = {
+    TicketType.PRIVACY: Priority.P1,
+    TicketType.LEGAL: Priority.P1,
+    TicketType.REFUND: Priority.P1,
+    TicketType.COMPLAINT: Priority.P2,
+    TicketType.SALES_LEAD: Priority.P3,
+}
+
+_SLA_WINDOWS = {
+    Priority.P1: timedelta(hours=4),  # 4 часа для критичных
+    Priority.P2: timedelta(hours=24),  # 24 часа для высоких
+    Priority.P3: timedelta(hours=72),  # 72 часа для нормальных
+}
+_DEFAULT_SLA_WINDOW = timedelta(hours=72)
+
+_DEFAULT_ACTIONS = {
+    TicketType.PRIVACY: "process_data_request",
+    TicketType.LEGAL: "legal_review",
+    TicketType.REFUND: "process_refund",
+    TicketType.COMPLAINT: "investigate_complaint",
+    TicketType.SALES_LEAD: "call_back",
+}
+
+
+@dataclass(slots=True)
 class Ticket:
     """Тикет для handoff."""
 
@@ -57,18 +111,33 @@ class Ticket:
     @beartype
     def to_json(self) -> str:
         """Сериализовать тикет в JSON для CRM интеграции."""
-        data = asdict(self)
-        # Преобразовать datetime в ISO format
-        data["sla_deadline_at"] = self.sla_deadline_at.isoformat()
-        data["created_at"] = self.created_at.isoformat()
-        # Преобразовать enum в строки
-        data["ticket_type"] = self.ticket_type.value
-        data["priority"] = self.priority.value
-        return json.dumps(data, ensure_ascii=False, indent=2)
+        # Явный словарь вместо asdict: без рекурсивного deepcopy полей
+        data = {
+            "ticket_type": self.ticket_type.value,
+            "priority": self.priority.value,
+            "customer_contact": self.customer_contact,
+            "summary": self.summary,
+            "context": self.context,
+            "requested_action": self.requested_action,
+            "sla_deadline_at": self.sla_deadline_at.isoformat(),
+            "created_at": self.created_at.isoformat(),
+            "user_id": self.user_id,
+            "status": self.status,
+            "ticket_id": self.ticket_id,
+        }
+        return _encode_export(data)
 
 
 class TicketManager:
-    """Менеджер тикетов."""
+    """Менеджер тикетов.
+
+    После start() держит одно долгоживущее соединение (WAL) и записывает
+    тикеты пачками: вставки, пришедшие в пределах BATCH_WINDOW, попадают
+    в одну транзакцию. Без start() каждый тикет пишется отдельным соединением.
+    """
+
+    BATCH_WINDOW = 0.01  # секунды
+    EXPORT_DIR = Path("data/tickets")
 
     @beartype
     def __init__(self, db_path: Path) -> None:
@@ -78,6 +147,42 @@ class TicketManager:
             db_path: Путь к БД
         """
         self.db_path = db_path
+        self._db: aiosqlite.Connection | None = None
+        self._pending: list[tuple[Ticket, asyncio.Future[int]]] = []
+        self._wakeup = asyncio.Event()
+        self._writer_task: asyncio.Task[None] | None = None
+        # Запись пачки, начатая фоновой задачей (доводится до конца и при её отмене)
+        self._writing: asyncio.Future[None] | None = None
+        # Операции на общем соединении не должны пересекаться с транзакцией пачки
+        self._db_lock = asyncio.Lock()
+        self.EXPORT_DIR.mkdir(exist_ok=True)
+
+    async def start(self) -> None:
+        """Открыть соединение с БД и запустить фоновую запись тикетов."""
+        if self._db is not None:
+            return
+
+        self._db = await aiosqlite.connect(self.db_path)
+        await self._db.executescript(
+            "PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;"
+        )
+        self._writer_task = asyncio.create_task(self._writer_loop())
+
+    async def close(self) -> None:
+        """Записать ожидающие тикеты и закрыть соединение."""
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            await asyncio.gather(self._writer_task, return_exceptions=True)
+            self._writer_task = None
+
+        if self._writing is not None:
+            await asyncio.gather(self._writing, return_exceptions=True)
+            self._writing = None
+
+        if self._db is not None:
+            await self._write_pending()
+            await self._db.close()
+            self._db = None
 
     @beartype
     async def create_ticket(
@@ -107,8 +212,11 @@ class TicketManager:
         # Определить приоритет по типу
         priority = self._get_priority_by_type(ticket_type)
 
+        # Одно время для дедлайна SLA и created_at
+        now = datetime.now()
+
         # Определить SLA deadline
-        sla_deadline = self._calculate_sla_deadline(priority)
+        sla_deadline = self._calculate_sla_deadline(priority, now)
 
         # Создать контекст
         context = {
@@ -128,7 +236,7 @@ class TicketManager:
             context=context,
             requested_action=requested_action or self._default_action(ticket_type),
             sla_deadline_at=sla_deadline,
-            created_at=datetime.now(),
+            created_at=now,
             user_id=user_id,
             status="open",
         )
@@ -142,102 +250,175 @@ class TicketManager:
 
         return ticket
 
-    @beartype
     def _get_priority_by_type(self, ticket_type: TicketType) -> Priority:
         """Определить приоритет по типу тикета."""
-        priority_map = {
-            TicketType.PRIVACY: Priority.P1,
-            TicketType.LEGAL: Priority.P1,
-            TicketType.REFUND: Priority.P1,
-            TicketType.COMPLAINT: Priority.P2,
-            TicketType.SALES_LEAD: Priority.P3,
-        }
-        return priority_map.get(ticket_type, Priority.P3)
+        return _PRIORITY_BY_TYPE.get(ticket_type, Priority.P3)
 
-    @beartype
-    def _calculate_sla_deadline(self, priority: Priority) -> datetime:
-        """Рассчитать SLA deadline."""
-        now = datetime.now()
+    def _calculate_sla_deadline(
+        self, priority: Priority, now: datetime | None = None
+    ) -> datetime:
+        """Рассчитать SLA deadline.
 
-        sla_hours = {
-            Priority.P1: 4,  # 4 часа для критичных
-            Priority.P2: 24,  # 24 часа для высоких
-            Priority.P3: 72,  # 72 часа для нормальных
-        }
+        Args:
+            priority: Приоритет тикета
+            now: Момент отсчёта (по умолчанию текущее время)
+        """
+        if now is None:
+            now = datetime.now()
 
-        hours = sla_hours.get(priority, 72)
-        return now + timedelta(hours=hours)
+        return now + _SLA_WINDOWS.get(priority, _DEFAULT_SLA_WINDOW)
 
-    @beartype
     def _default_action(self, ticket_type: TicketType) -> str:
         """Дефолтное действие по типу тикета."""
-        actions = {
-            TicketType.PRIVACY: "process_data_request",
-            TicketType.LEGAL: "legal_review",
-            TicketType.REFUND: "process_refund",
-            TicketType.COMPLAINT: "investigate_complaint",
-            TicketType.SALES_LEAD: "call_back",
-        }
-        return actions.get(ticket_type, "review")
+        return _DEFAULT_ACTIONS.get(ticket_type, "review")
 
     @beartype
     async def _save_to_db(self, ticket: Ticket) -> int:
-        """Сохранить тикет в БД."""
+        """Сохранить тикет в БД.
+
+        Если менеджер запущен, тикет ставится в очередь пакетной записи
+        и метод возвращается после фиксации транзакции.
+        """
+        if self._db is None:
+            async with self._connect() as db:
+                cursor = await db.execute(_INSERT_TICKET_SQL, _ticket_row(ticket))
+                await db.commit()
+                return cursor.lastrowid or 0
+
+        future: asyncio.Future[int] = asyncio.get_running_loop().create_future()
+        self._pending.append((ticket, future))
+        self._wakeup.set()
+        return await future
+
+    @asynccontextmanager
+    async def _connect(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Соединение с БД: общее долгоживущее после start(), иначе новое."""
+        if self._db is not None:
+            async with self._db_lock:
+                yield self._db
+            return
+
         async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
-                """
-                INSERT INTO tickets (
-                    user_id, ticket_type, priority, summary,
-                    context_json, requested_action, sla_deadline_at,
-                    status, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    ticket.user_id,
-                    ticket.ticket_type.value,
-                    ticket.priority.value,
-                    ticket.summary,
-                    json.dumps(ticket.context, ensure_ascii=False),
-                    ticket.requested_action,
-                    ticket.sla_deadline_at.isoformat(),
-                    ticket.status,
-                    ticket.created_at.isoformat(),
-                ),
-            )
-            await db.commit()
-            return cursor.lastrowid or 0
+            yield db
+
+    async def _writer_loop(self) -> None:
+        """Фоновая задача: собирать вставки в пачки и писать одной транзакцией."""
+        while True:
+            await self._wakeup.wait()
+            # Небольшое окно, чтобы одновременные тикеты попали в одну пачку
+            await asyncio.sleep(self.BATCH_WINDOW)
+            self._wakeup.clear()
+            # shield: отмена задачи в close() не обрывает начатую транзакцию,
+            # close() дожидается её через _writing
+            self._writing = asyncio.ensure_future(self._write_pending())
+            await asyncio.shield(self._writing)
+            self._writing = None
+
+    async def _write_pending(self) -> None:
+        """Записать накопленные тикеты одной транзакцией."""
+        if not self._pending or self._db is None:
+            return
+
+        batch, self._pending = self._pending, []
+        async with self._connect() as db:
+            try:
+                ticket_ids = []
+                for ticket, _ in batch:
+                    cursor = await db.execute(_INSERT_TICKET_SQL, _ticket_row(ticket))
+                    ticket_ids.append(cursor.lastrowid or 0)
+                await db.commit()
+            except Exception as e:
+                logger.error(f"Error saving tickets: {e}")
+                await db.rollback()
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+        for (_, future), ticket_id in zip(batch, ticket_ids):
+            if not future.done():
+                future.set_result(ticket_id)
 
     @beartype
     async def _export_to_json(self, ticket: Ticket) -> None:
         """Экспортировать тикет в JSON файл для CRM интеграции."""
-        export_dir = Path("data/tickets")
-        export_dir.mkdir(exist_ok=True)
-
         filename = f"ticket_{ticket.ticket_id}_{ticket.created_at.strftime('%Y%m%d_%H%M%S')}.json"
-        filepath = export_dir / filename
+        filepath = self.EXPORT_DIR / filename
 
-        filepath.write_text(ticket.to_json(), encoding="utf-8")
+        # Запись на диск в отдельном потоке, чтобы не блокировать event loop
+        await asyncio.to_thread(filepath.write_text, ticket.to_json(), "utf-8")
 
     @beartype
     async def get_ticket(self, ticket_id: int) -> Ticket | None:
-        """Получить тикет по ID."""
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(
-                "SELECT * FROM tickets WHERE id = ?", (ticket_id,)
-            ) as cursor:
+        """Получить тикет по ID.
+
+        Контакт клиента в таблице tickets не хранится, поэтому
+        customer_contact у загруженного тикета пустой.
+
+        Args:
+            ticket_id: ID тикета
+
+        Returns:
+            Ticket | None: Тикет или None если не найден
+        """
+        async with self._connect() as db:
+            async with db.execute(_SELECT_TICKET_SQL, (ticket_id,)) as cursor:
                 row = await cursor.fetchone()
-                if not row:
-                    return None
 
-                # Парсинг row в Ticket
-                # (упрощённая версия, в production нужен полный парсинг)
-                return None  # TODO: implement
+        if not row:
+            return None
+
+        return _ticket_from_row(row)
 
     @beartype
     async def update_status(self, ticket_id: int, new_status: str) -> None:
         """Обновить статус тикета."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             await db.execute(
                 "UPDATE tickets SET status = ? WHERE id = ?", (new_status, ticket_id)
             )
             await db.commit()
+
+
+def _ticket_from_row(row: Sequence[Any]) -> Ticket:
+    """Собрать тикет из строки _SELECT_TICKET_SQL."""
+    (
+        ticket_id,
+        user_id,
+        ticket_type,
+        priority,
+        summary,
+        context_json,
+        requested_action,
+        sla_deadline_at,
+        status,
+        created_at,
+    ) = row
+    return Ticket(
+        ticket_type=TicketType(ticket_type),
+        priority=Priority(priority),
+        customer_contact="",
+        summary=summary,
+        context=json.loads(context_json),
+        requested_action=requested_action or "",
+        sla_deadline_at=datetime.fromisoformat(sla_deadline_at),
+        created_at=datetime.fromisoformat(created_at),
+        user_id=user_id,
+        status=status,
+        ticket_id=ticket_id,
+    )
+
+
+def _ticket_row(ticket: Ticket) -> tuple[object, ...]:
+    """Параметры INSERT для тикета."""
+    return (
+        ticket.user_id,
+        ticket.ticket_type.value,
+        ticket.priority.value,
+        ticket.summary,
+        _encode_context(ticket.context),
+        ticket.requested_action,
+        ticket.sla_deadline_at.isoformat(),
+        ticket.status,
+        ticket.created_at.isoformat(),
+    )
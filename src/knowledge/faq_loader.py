@@ -2,16 +2,45 @@
 
 from __future__ import annotations
 
+import asyncio
+import itertools
 import json
-from dataclasses import dataclass
+import re
+import weakref
+from collections import defaultdict
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 from beartype import beartype
 
+# Версии баз знаний: каждая новая KnowledgeBase получает уникальный номер,
+# по которому поиск кэширует результаты (перезагрузка FAQ = новая версия)
+_kb_versions = itertools.count(1)
+_knowledge_bases: weakref.WeakValueDictionary[int, KnowledgeBase] = (
+    weakref.WeakValueDictionary()
+)
+
+# Регулярные выражения нормализации компилируются один раз при импорте
+_WHITESPACE_RE = re.compile(r'\s+')
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+
+
+def normalize_text(text: str) -> str:
+    """Нормализовать текст для поиска.
+    
+    Args:
+        text: Исходный текст
+        
+    Returns:
+        str: Нормализованный текст
+    """
+    # Нижний регистр, удаление знаков препинания и схлопывание пробелов
+    return _WHITESPACE_RE.sub(' ', _PUNCTUATION_RE.sub('', text.lower())).strip()
+
 
 @beartype
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Company:
     """Информация о компании."""
 
@@ -24,7 +53,7 @@ class Company:
 
 
 @beartype
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Service:
     """Описание услуги."""
 
@@ -37,19 +66,47 @@ class Service:
 
 
 @beartype
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FAQItem:
-    """Элемент FAQ."""
+    """Элемент FAQ.
+
+    Нормализованные формы вопроса, ключевых слов и ответа вычисляются
+    один раз при создании и используются поиском вместо нормализации
+    на каждый запрос.
+    """
 
-    id: int
+    id: int = field(default=0, kw_only=True)
     question: str
     answer: str
     category: str
-    keywords: list[str]
+    keywords: tuple[str, ...]
+
+    question_norm: str = field(init=False, repr=False, compare=False)
+    question_word_set: frozenset[str] = field(init=False, repr=False, compare=False)
+    keyword_norms: tuple[str, ...] = field(init=False, repr=False, compare=False)
+    keyword_word_sets: tuple[frozenset[str], ...] = field(
+        init=False, repr=False, compare=False
+    )
+    answer_word_set: frozenset[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Предвычислить нормализованные токены для поиска."""
+        question_norm = normalize_text(self.question)
+        keyword_norms = tuple(normalize_text(k) for k in self.keywords)
+        # Датакласс заморожен - заполняем производные поля через object.__setattr__
+        object.__setattr__(self, "question_norm", question_norm)
+        object.__setattr__(self, "question_word_set", frozenset(question_norm.split()))
+        object.__setattr__(self, "keyword_norms", keyword_norms)
+        object.__setattr__(
+            self, "keyword_word_sets", tuple(frozenset(k.split()) for k in keyword_norms)
+        )
+        object.__setattr__(
+            self, "answer_word_set", frozenset(normalize_text(self.answer).split())
+        )
 
 
 @beartype
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CommonPhrases:
     """Стандартные фразы бота."""
 
@@ -61,7 +118,7 @@ class CommonPhrases:
 
 
 @beartype
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True, weakref_slot=True)
 class KnowledgeBase:
     """База знаний FAQ."""
 
@@ -70,6 +127,46 @@ class KnowledgeBase:
     faq: list[FAQItem]
     phrases: CommonPhrases
 
+    # Инвертированный индекс: токен -> индексы элементов FAQ, где он встречается
+    faq_index: dict[str, tuple[int, ...]] = field(
+        init=False, repr=False, compare=False
+    )
+    # Ключевые фразы с индексом элемента (ищутся как подстроки запроса)
+    faq_keywords: tuple[tuple[str, int], ...] = field(
+        init=False, repr=False, compare=False
+    )
+
+    # Уникальная версия базы знаний (ключ кэша результатов поиска)
+    version: int = field(init=False, repr=False, compare=False)
+
+    _services_by_id: dict[str, Service] = field(init=False, repr=False, compare=False)
+    _categories: tuple[str, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Построить инвертированный индекс FAQ и справочники для быстрых lookup."""
+        version = next(_kb_versions)
+        object.__setattr__(self, "version", version)
+        _knowledge_bases[version] = self
+
+        # При повторяющихся ID побеждает первая услуга, как при линейном поиске
+        services_by_id: dict[str, Service] = {}
+        for service in self.services:
+            services_by_id.setdefault(service.id, service)
+        object.__setattr__(self, "_services_by_id", services_by_id)
+        object.__setattr__(
+            self, "_categories", tuple(dict.fromkeys(item.category for item in self.faq))
+        )
+        object.__setattr__(self, "faq_index", _build_faq_index(self.faq))
+        object.__setattr__(
+            self,
+            "faq_keywords",
+            tuple(
+                (keyword, idx)
+                for idx, item in enumerate(self.faq)
+                for keyword in item.keyword_norms
+            ),
+        )
+
     def get_service_by_id(self, service_id: str) -> Service | None:
         """Получить услугу по ID.
 
@@ -79,10 +176,7 @@ class KnowledgeBase:
         Returns:
             Service | None: Услуга или None если не найдена
         """
-        for service in self.services:
-            if service.id == service_id:
-                return service
-        return None
+        return self._services_by_id.get(service_id)
 
     def get_faq_by_category(self, category: str) -> list[FAQItem]:
         """Получить FAQ по категории.
@@ -101,7 +195,36 @@ class KnowledgeBase:
         Returns:
             list[str]: Список уникальных категорий
         """
-        return list({item.category for item in self.faq})
+        return list(self._categories)
+
+
+def _build_faq_index(faq: list[FAQItem]) -> dict[str, tuple[int, ...]]:
+    """Построить инвертированный индекс по токенам FAQ.
+
+    Слова вопроса индексируются вместе со всеми подстроками от 3 символов,
+    так как поиск засчитывает вхождение слова запроса в вопрос как подстроки.
+    Слова ключевых фраз и ответа индексируются целиком.
+
+    Args:
+        faq: Элементы FAQ
+
+    Returns:
+        dict[str, tuple[int, ...]]: Токен -> индексы элементов по возрастанию
+    """
+    postings: defaultdict[str, set[int]] = defaultdict(set)
+    for idx, item in enumerate(faq):
+        for word in item.question_word_set:
+            postings[word].add(idx)
+            for start in range(len(word) - 2):
+                for end in range(start + 3, len(word) + 1):
+                    postings[word[start:end]].add(idx)
+        for keyword_words in item.keyword_word_sets:
+            for word in keyword_words:
+                postings[word].add(idx)
+        for word in item.answer_word_set:
+            postings[word].add(idx)
+
+    return {token: tuple(sorted(ids)) for token, ids in postings.items()}
 
 
 @beartype
@@ -134,8 +257,9 @@ class FAQLoader:
         if not self.faq_path.exists():
             raise FileNotFoundError(f"FAQ файл не найден: {self.faq_path}")
 
-        with open(self.faq_path, encoding="utf-8") as f:
-            data: dict[str, Any] = json.load(f)
+        # Чтение файла в отдельном потоке, чтобы не блокировать event loop
+        raw = await asyncio.to_thread(self.faq_path.read_bytes)
+        data: dict[str, Any] = json.loads(raw)
 
         # Парсинг данных компании
         company_data = data.get("company", {})
@@ -149,30 +273,35 @@ class FAQLoader:
             telegram=contact_data.get("telegram", ""),
         )
 
-        # Парсинг услуг
-        services = [
-            Service(
-                id=s.get("id", ""),
-                name=s.get("name", ""),
-                description=s.get("description", ""),
-                price=s.get("price", ""),
-                duration=s.get("duration", ""),
-                benefits=s.get("benefits", []),
-            )
-            for s in data.get("services", [])
-        ]
-
-        # Парсинг FAQ
-        faq_items = [
-            FAQItem(
-                id=item.get("id", 0),
-                question=item.get("question", ""),
-                answer=item.get("answer", ""),
-                category=item.get("category", "general"),
-                keywords=item.get("keywords", []),
-            )
-            for item in data.get("faq", [])
-        ]
+        # Обязательные поля читаются напрямую (ошибка структуры сразу видна),
+        # .get остаётся только для необязательных
+        try:
+            # Парсинг услуг
+            services = [
+                Service(
+                    id=s["id"],
+                    name=s["name"],
+                    description=s.get("description", ""),
+                    price=s.get("price", ""),
+                    duration=s.get("duration", ""),
+                    benefits=s.get("benefits", []),
+                )
+                for s in data.get("services", [])
+            ]
+
+            # Парсинг FAQ
+            faq_items = [
+                FAQItem(
+                    id=item.get("id", 0),
+                    question=item["question"],
+                    answer=item["answer"],
+                    category=item.get("category", "general"),
+                    keywords=tuple(item.get("keywords", ())),
+                )
+                for item in data["faq"]
+            ]
+        except KeyError as e:
+            raise ValueError(f"В FAQ файле отсутствует обязательное поле: {e}") from e
 
         # Парсинг стандартных фраз
         phrases_data = data.get("common_phrases", {})
@@ -194,5 +323,21 @@ class FAQLoader:
         return self._cache
 
     def clear_cache(self) -> None:
-        """Очистить кэш (для перезагрузки базы знаний)."""
+        """Очистить кэш (для перезагрузки базы знаний).
+
+        Следующий load() создаст базу знаний с новой версией, поэтому
+        закэшированные результаты поиска по старой базе больше не используются.
+        """
         self._cache = None
+
+
+def get_knowledge_base_by_version(version: int) -> KnowledgeBase | None:
+    """Получить живую базу знаний по её версии.
+
+    Args:
+        version: Версия базы знаний
+
+    Returns:
+        KnowledgeBase | None: База знаний или None если она уже удалена
+    """
+    return _knowledge_bases.get(version)
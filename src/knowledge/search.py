@@ -2,100 +2,206 @@
 
 from __future__ import annotations
 
-import re
+import heapq
 from functools import lru_cache
+from operator import itemgetter
 
 from beartype import beartype
 
-from src.knowledge.faq_loader import FAQItem, KnowledgeBase
+from src.knowledge.faq_loader import (
+    FAQItem,
+    KnowledgeBase,
+    get_knowledge_base_by_version,
+    normalize_text,
+)
 
+# Стоп-слова которые игнорируем (уменьшенный список для лучшего понимания)
+_STOP_WORDS: frozenset[str] = frozenset({
+    "как", "что", "где", "когда", "почему", "зачем", "какой", "какая", "какие",
+    "это", "мне", "вы", "ты", "у", "в", "на", "с", "и", "или", "а", "но",
+    "скажи", "можно", "нужно", "есть",
+})
+
+
+def _significant_words(query_normalized: str) -> tuple[str, ...]:
+    """Выделить значимые слова нормализованного запроса.
 
-def normalize_text(text: str) -> str:
-    """Нормализовать текст для поиска.
-    
     Args:
-        text: Исходный текст
-        
+        query_normalized: Нормализованный текст запроса
+
     Returns:
-        str: Нормализованный текст
+        tuple[str, ...]: Слова без стоп-слов и коротких слов
     """
-    # Приводим к нижнему регистру
-    text = text.lower()
-    # Удаляем лишние пробелы
-    text = re.sub(r'\s+', ' ', text)
-    # Удаляем знаки препинания (кроме пробелов)
-    text = re.sub(r'[^\w\s]', '', text)
-    return text.strip()
+    # Фильтруем стоп-слова и короткие слова
+    return tuple(
+        word for word in query_normalized.split()
+        if len(word) > 2 and word not in _STOP_WORDS
+    )
 
 
-@beartype
-def calculate_relevance(query: str, faq_item: FAQItem) -> float:
-    """Рассчитать релевантность FAQ элемента к запросу.
+@lru_cache(maxsize=1024)
+def _prepare_query(query: str) -> tuple[str, tuple[str, ...]]:
+    """Нормализовать запрос и выделить значимые слова (с кэшем).
+
+    Один и тот же запрос обычно проходит quick_faq_check, затем search_faq
+    или оценку по нескольким элементам - нормализуется он один раз.
 
     Args:
         query: Текст запроса пользователя
-        faq_item: Элемент FAQ
 
     Returns:
-        float: Оценка релевантности (0.0 - 1.0)
+        tuple[str, tuple[str, ...]]: Нормализованный текст и значимые слова
     """
-    # Нормализация текста для более точного поиска
     query_normalized = normalize_text(query)
-    score = 0.0
+    return query_normalized, _significant_words(query_normalized)
 
-    # Стоп-слова которые игнорируем (уменьшенный список для лучшего понимания)
-    stop_words = {
-        "как", "что", "где", "когда", "почему", "зачем", "какой", "какая", "какие",
-        "это", "мне", "вы", "ты", "у", "в", "на", "с", "и", "или", "а", "но",
-        "скажи", "можно", "нужно", "есть",
-    }
 
-    # Фильтруем стоп-слова и короткие слова
-    query_words = [
-        word for word in query_normalized.split()
-        if len(word) > 2 and word not in stop_words
-    ]
+def _candidate_items(
+    query_normalized: str,
+    query_words: tuple[str, ...],
+    knowledge_base: KnowledgeBase,
+) -> list[FAQItem]:
+    """Отобрать по инвертированному индексу элементы FAQ, которые могут совпасть.
 
+    Args:
+        query_normalized: Нормализованный текст запроса
+        query_words: Значимые слова запроса
+        knowledge_base: База знаний
+
+    Returns:
+        list[FAQItem]: Элементы с ненулевой релевантностью
+            (в исходном порядке базы знаний)
+    """
     if not query_words:
-        return 0.0
+        return []
+
+    index = knowledge_base.faq_index
+    candidate_ids: set[int] = set()
+    for word in query_words:
+        candidate_ids.update(index.get(word, ()))
+
+    # Ключевая фраза засчитывается, если входит в запрос как подстрока
+    candidate_ids.update(
+        idx for keyword, idx in knowledge_base.faq_keywords if keyword in query_normalized
+    )
+
+    faq = knowledge_base.faq
+    return [faq[idx] for idx in sorted(candidate_ids)]
+
+
+def _score(
+    query_normalized: str, query_words: tuple[str, ...], faq_item: FAQItem
+) -> float:
+    """Рассчитать релевантность по уже подготовленному запросу.
+
+    Args:
+        query_normalized: Нормализованный текст запроса
+        query_words: Значимые слова запроса (непустые)
+        faq_item: Элемент FAQ
+
+    Returns:
+        float: Оценка релевантности (0.0 - 1.0)
+    """
+    score = 0.0
+    word_count = len(query_words)
+
+    # Проверка вопроса (нормализованные формы FAQ предвычислены при загрузке).
+    # Совпадения считаются через map(set.__contains__) - цикл выполняется в C
+    question_words = faq_item.question_word_set
 
-    # Проверка вопроса
-    question_normalized = normalize_text(faq_item.question)
-    question_words = set(question_normalized.split())
-    
     # Точное совпадение всех слов запроса
-    if all(word in question_normalized for word in query_words):
+    if all(map(faq_item.question_norm.__contains__, query_words)):
         score += 1.0
     else:
         # Считаем сколько значимых слов совпало (целые слова, не подстроки)
-        matched_words = sum(1 for word in query_words if word in question_words)
+        matched_words = sum(map(question_words.__contains__, query_words))
         if matched_words > 0:
-            score += 0.6 * (matched_words / len(query_words))
+            score += 0.6 * (matched_words / word_count)
 
     # Проверка ключевых слов
-    keywords_normalized = [normalize_text(k) for k in faq_item.keywords]
-    for keyword in keywords_normalized:
+    for keyword, keyword_words in zip(
+        faq_item.keyword_norms, faq_item.keyword_word_sets
+    ):
         if keyword in query_normalized:
             score += 0.8
         else:
             # Частичное совпадение только значимых слов
-            keyword_words = set(keyword.split())
-            matched_keyword_words = sum(1 for word in query_words if word in keyword_words)
+            matched_keyword_words = sum(map(keyword_words.__contains__, query_words))
             if matched_keyword_words > 0:
-                score += 0.4 * (matched_keyword_words / len(query_words))
+                score += 0.4 * (matched_keyword_words / word_count)
 
-    # Проверка ответа (меньший вес)
-    answer_normalized = normalize_text(faq_item.answer)
-    answer_words = set(answer_normalized.split())
-    
-    # Считаем сколько значимых слов совпало (целые слова)
-    matched_in_answer = sum(1 for word in query_words if word in answer_words)
+    # Проверка ответа (меньший вес), только целые слова
+    matched_in_answer = sum(map(faq_item.answer_word_set.__contains__, query_words))
     if matched_in_answer > 0:
-        score += 0.2 * (matched_in_answer / len(query_words))
+        score += 0.2 * (matched_in_answer / word_count)
 
     return min(score, 1.0)
 
 
+@lru_cache(maxsize=4096)
+def _scored_candidates(
+    query_normalized: str, query_words: tuple[str, ...], kb_version: int
+) -> tuple[tuple[FAQItem, float], ...]:
+    """Оценки кандидатов для запроса (с кэшем на повторяющиеся запросы).
+
+    Args:
+        query_normalized: Нормализованный текст запроса
+        query_words: Значимые слова запроса
+        kb_version: Версия базы знаний (KnowledgeBase.version)
+
+    Returns:
+        tuple[tuple[FAQItem, float], ...]: Кандидаты и их релевантность
+            в порядке базы знаний
+    """
+    knowledge_base = get_knowledge_base_by_version(kb_version)
+    if knowledge_base is None:
+        return ()
+
+    return tuple(
+        (item, _score(query_normalized, query_words, item))
+        for item in _candidate_items(query_normalized, query_words, knowledge_base)
+    )
+
+
+def calculate_relevance(query: str, faq_item: FAQItem) -> float:
+    """Рассчитать релевантность FAQ элемента к запросу.
+
+    Args:
+        query: Текст запроса пользователя
+        faq_item: Элемент FAQ
+
+    Returns:
+        float: Оценка релевантности (0.0 - 1.0)
+    """
+    # Нормализация текста для более точного поиска
+    query_normalized, query_words = _prepare_query(query)
+
+    if not query_words:
+        return 0.0
+
+    return _score(query_normalized, query_words, faq_item)
+
+
+def calculate_relevance_batch(query: str, faq_items: list[FAQItem]) -> list[float]:
+    """Рассчитать релевантность нескольких FAQ элементов к одному запросу.
+
+    Запрос нормализуется один раз, а не для каждого элемента.
+
+    Args:
+        query: Текст запроса пользователя
+        faq_items: Элементы FAQ
+
+    Returns:
+        list[float]: Оценки релевантности (0.0 - 1.0) в порядке faq_items
+    """
+    query_normalized, query_words = _prepare_query(query)
+
+    if not query_words:
+        return [0.0] * len(faq_items)
+
+    return [_score(query_normalized, query_words, item) for item in faq_items]
+
+
 @beartype
 def quick_faq_check(
     query: str,
@@ -116,20 +222,23 @@ def quick_faq_check(
     """
     if not knowledge_base.faq:
         return None
-    
-    # Поиск с высоким порогом
-    scored_items = []
-    for item in knowledge_base.faq:
-        score = calculate_relevance(query, item)
-        if score >= min_score:
-            scored_items.append((item, score))
-    
-    if not scored_items:
+
+    # Запрос без значимых слов (только стоп-слова) не совпадёт ни с чем
+    query_normalized, query_words = _prepare_query(query)
+    if not query_words:
         return None
-    
-    # Вернуть лучший результат
-    scored_items.sort(key=lambda x: x[1], reverse=True)
-    return scored_items[0]
+
+    # Поиск с высоким порогом (только по кандидатам из индекса)
+    scored_items = _scored_candidates(
+        query_normalized, query_words, knowledge_base.version
+    )
+
+    # Вернуть лучший результат (при равенстве - первый по порядку в базе)
+    return max(
+        (pair for pair in scored_items if pair[1] >= min_score),
+        key=itemgetter(1),
+        default=None,
+    )
 
 
 @beartype
@@ -150,23 +259,23 @@ def search_faq(
     Returns:
         list[FAQItem]: Список наиболее релевантных FAQ элементов
     """
-    if not query.strip():
+    # Пустой запрос или запрос только из стоп-слов - искать нечего
+    query_normalized, query_words = _prepare_query(query)
+    if not query_words:
         return []
 
-    # Рассчитать релевантность для каждого FAQ элемента
-    scored_items = [
-        (faq_item, calculate_relevance(query, faq_item))
-        for faq_item in knowledge_base.faq
-    ]
-
-    # Отфильтровать элементы с низкой релевантностью
-    scored_items = [(item, score) for item, score in scored_items if score >= min_score]
-
-    # Отсортировать по убыванию релевантности
-    scored_items.sort(key=lambda x: x[1], reverse=True)
+    # Релевантность FAQ элементов, найденных по индексу (кэшируется по запросу)
+    scored_items = _scored_candidates(
+        query_normalized, query_words, knowledge_base.version
+    )
 
-    # Вернуть top_k результатов
-    return [item for item, _ in scored_items[:top_k]]
+    # Вернуть top_k самых релевантных элементов выше порога
+    top_items = heapq.nlargest(
+        top_k,
+        (pair for pair in scored_items if pair[1] >= min_score),
+        key=itemgetter(1),
+    )
+    return [item for item, _ in top_items]
 
 
 @beartype
@@ -187,8 +296,10 @@ def format_faq_results(faq_items: list[FAQItem]) -> str:
         return faq_items[0].answer
 
     # Несколько результатов - показать все с нумерацией
-    result = "Вот что я нашел по вашему запросу:\n\n"
-    for i, item in enumerate(faq_items, 1):
-        result += f"{i}. {item.question}\n{item.answer}\n\n"
+    parts = ["Вот что я нашел по вашему запросу:\n\n"]
+    parts.extend(
+        f"{i}. {item.question}\n{item.answer}\n\n"
+        for i, item in enumerate(faq_items, 1)
+    )
 
-    return result.strip()
+    return "".join(parts).strip()
@@ -3,31 +3,49 @@
 from __future__ import annotations
 
 import asyncio
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
+from collections.abc import Awaitable, Callable
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any
 
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
+from aiogram.types import TelegramObject
 from beartype import beartype
 
 from src.ai.ollama_client import OllamaClient
 from src.bot.handlers import chat, menu, privacy, start  # Вернули старый рабочий chat handler
 from src.config import get_config
+from src.database.connection import close_connections
 from src.database.context import ConversationContext
 from src.database.models import check_database_health, init_database
+from src.funnel.repository import close_funnel_repositories
+from src.handoff.ticket_manager import TicketManager
 from src.knowledge.faq_loader import FAQLoader
+from src.metrics.calculator import MetricsCalculator
+from src.metrics.event_logger import close_event_writers
 
-# Настройка логирования
+# Настройка логирования. Записи только кладутся в очередь, а вывод в консоль
+# и файл делает отдельный поток: event loop не блокируется на вводе-выводе
+_log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler("bot.log", encoding="utf-8"),
-    ],
+    handlers=[logging.handlers.QueueHandler(_log_queue)],
 )
+_log_listener = logging.handlers.QueueListener(
+    _log_queue,
+    logging.StreamHandler(sys.stdout),
+    logging.FileHandler("bot.log", encoding="utf-8"),
+)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
 
@@ -88,6 +106,10 @@ async def main() -> None:
     # Создать менеджер контекста диалогов
     context_manager = ConversationContext(config.db_path)
 
+    # Менеджер тикетов с долгоживущим соединением и пакетной записью
+    ticket_manager = TicketManager(config.db_path)
+    await ticket_manager.start()
+
     # Инициализировать бота и диспетчер
     bot = Bot(
         token=config.telegram_bot_token,
@@ -95,25 +117,40 @@ async def main() -> None:
     )
     dp = Dispatcher()
 
-    # Middleware для передачи зависимостей в handlers
-    @dp.message.middleware()
-    @beartype
-    async def inject_dependencies(handler, event, data):  # type: ignore
+    # Зависимости для handlers: собираются один раз, в middleware только
+    # сливаются в data одним dict.update
+    injected = MappingProxyType(
+        {
+            "knowledge_base": knowledge_base,
+            "context": context_manager,
+            "ollama_client": ollama_client,
+            "ticket_manager": ticket_manager,
+        }
+    )
+
+    # Middleware для передачи зависимостей в handlers (регистрируются обычным
+    # вызовом ниже, а не декоратором: так mypy проверяет сигнатуру middleware)
+    async def inject_dependencies(
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
         """Middleware для внедрения зависимостей."""
-        data["knowledge_base"] = knowledge_base
-        data["context"] = context_manager
-        data["ollama_client"] = ollama_client
+        data.update(injected)
         return await handler(event, data)
 
-    @dp.callback_query.middleware()
-    @beartype
-    async def inject_dependencies_callback(handler, event, data):  # type: ignore
+    async def inject_dependencies_callback(
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
         """Middleware для внедрения зависимостей в callback."""
-        data["knowledge_base"] = knowledge_base
-        data["context"] = context_manager
-        data["ollama_client"] = ollama_client
+        data.update(injected)
         return await handler(event, data)
 
+    dp.message.middleware(inject_dependencies)
+    dp.callback_query.middleware(inject_dependencies_callback)
+
     # Зарегистрировать handlers (порядок важен!)
     dp.include_router(start.router)  # Команды /start, /help, /reset
     dp.include_router(privacy.router)  # Команда /privacy
@@ -136,8 +173,21 @@ async def main() -> None:
             except Exception as e:
                 logger.error(f"Error in cleanup_task: {e}")
 
-    # Запустить фоновую задачу очистки
+    # Периодический пересчёт недельных метрик
+    metrics_calculator = MetricsCalculator(config.db_path)
+
+    async def metrics_rollup_task() -> None:
+        """Фоновая задача для обновления таблицы недельных метрик."""
+        while True:
+            try:
+                await metrics_calculator.refresh_weekly_rollup()
+            except Exception as e:
+                logger.error(f"Error in metrics_rollup_task: {e}")
+            await asyncio.sleep(3600)  # Раз в час
+
+    # Запустить фоновые задачи
     cleanup_task_obj = asyncio.create_task(cleanup_task())
+    metrics_task_obj = asyncio.create_task(metrics_rollup_task())
 
     try:
         logger.info("[OK] Bot started and ready to receive messages!")
@@ -152,7 +202,12 @@ async def main() -> None:
     finally:
         # Graceful shutdown
         cleanup_task_obj.cancel()
+        metrics_task_obj.cancel()
         await ollama_client.close()
+        await ticket_manager.close()
+        await close_funnel_repositories()
+        await close_event_writers()
+        await close_connections()
         await bot.session.close()
         logger.info("[STOP] Bot stopped")
 
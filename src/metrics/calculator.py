@@ -2,21 +2,30 @@
 
 from __future__ import annotations
 
-import json
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 
-import aiosqlite
 from beartype import beartype
 
+from src.database.connection import get_connection
+
 
 class MetricsCalculator:
-    """Калькулятор метрик."""
+    """Калькулятор метрик.
+
+    Результаты calculate_* кэшируются на CACHE_TTL секунд: метрики
+    за дни не меняются заметно от секунды к секунде.
+    """
+
+    CACHE_TTL = 60.0  # секунды
 
     @beartype
     def __init__(self, db_path: Path) -> None:
         """Инициализация."""
         self.db_path = db_path
+        # (метрика, days) -> (момент истечения по time.monotonic(), значение)
+        self._cache: dict[tuple[str, int], tuple[float, float]] = {}
 
     @beartype
     async def calculate_frt_p50(self, days: int = 7) -> float:
@@ -28,33 +37,32 @@ class MetricsCalculator:
         Returns:
             float: FRT P50 в секундах
         """
+        cached = self._get_cached("frt_p50", days)
+        if cached is not None:
+            return cached
+
         cutoff = (datetime.now() - timedelta(days=days)).isoformat()
 
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(
-                """
-                SELECT event_data FROM events
+        # Медиана считается в SQLite: наружу возвращается одна строка
+        db = await get_connection(self.db_path)
+        rows = await db.execute_fetchall(
+            """
+            WITH frt AS (
+                SELECT response_time_ms AS ms
+                FROM events
                 WHERE event_type = 'first_bot_response' AND timestamp > ?
-                """,
-                (cutoff,),
-            ) as cursor:
-                rows = await cursor.fetchall()
-
-        if not rows:
-            return 0.0
-
-        response_times = []
-        for row in rows:
-            data = json.loads(row[0])
-            if "response_time_ms" in data:
-                response_times.append(data["response_time_ms"] / 1000)  # в секундах
-
-        if not response_times:
-            return 0.0
-
-        response_times.sort()
-        median_idx = len(response_times) // 2
-        return response_times[median_idx]
+                    AND response_time_ms IS NOT NULL
+            )
+            SELECT ms FROM frt
+            ORDER BY ms
+            LIMIT 1 OFFSET (SELECT COUNT(*) / 2 FROM frt)
+            """,
+            (cutoff,),
+        )
+
+        row = next(iter(rows), None)
+        frt = row[0] / 1000 if row is not None else 0.0  # в секундах
+        return self._store("frt_p50", days, frt)
 
     @beartype
     async def calculate_containment_rate(self, days: int = 7) -> float:
@@ -66,53 +74,102 @@ class MetricsCalculator:
         Returns:
             float: Containment rate (0.0 - 1.0)
         """
+        cached = self._get_cached("containment", days)
+        if cached is not None:
+            return cached
+
         cutoff = (datetime.now() - timedelta(days=days)).isoformat()
 
-        async with aiosqlite.connect(self.db_path) as db:
-            # Всего диалогов
-            async with db.execute(
-                """
-                SELECT COUNT(DISTINCT user_id) FROM events
-                WHERE event_type = 'conversation_started' AND timestamp > ?
-                """,
-                (cutoff,),
-            ) as cursor:
-                row = await cursor.fetchone()
-                total = row[0] if row else 0
-
-            if total == 0:
-                return 0.0
-
-            # Диалогов с handoff
-            async with db.execute(
-                """
-                SELECT COUNT(DISTINCT user_id) FROM events
-                WHERE event_type = 'ticket_created' AND timestamp > ?
-                """,
-                (cutoff,),
-            ) as cursor:
-                row = await cursor.fetchone()
-                handoff = row[0] if row else 0
-
-        return (total - handoff) / total if total > 0 else 0.0
+        # Всего диалогов и диалогов с handoff - одним проходом по событиям
+        db = await get_connection(self.db_path)
+        rows = await db.execute_fetchall(
+            """
+            SELECT
+                COUNT(DISTINCT CASE WHEN event_type = 'conversation_started'
+                    THEN user_id END),
+                COUNT(DISTINCT CASE WHEN event_type = 'ticket_created'
+                    THEN user_id END)
+            FROM events
+            WHERE event_type IN ('conversation_started', 'ticket_created')
+                AND timestamp > ?
+            """,
+            (cutoff,),
+        )
+
+        total, handoff = next(iter(rows), (0, 0))
+        containment = (total - handoff) / total if total > 0 else 0.0
+        return self._store("containment", days, containment)
+
+    def _get_cached(self, metric: str, days: int) -> float | None:
+        """Получить значение метрики из кэша, если оно ещё не устарело."""
+        entry = self._cache.get((metric, days))
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def _store(self, metric: str, days: int, value: float) -> float:
+        """Сохранить значение метрики в кэш и вернуть его."""
+        self._cache[(metric, days)] = (time.monotonic() + self.CACHE_TTL, value)
+        return value
+
+    @beartype
+    async def refresh_weekly_rollup(self) -> None:
+        """Пересчитать метрики текущей недели и сохранить в metrics_weekly.
+
+        Вызывается периодически фоновой задачей; прошлые недели
+        не пересчитываются, так как их события уже не меняются.
+        """
+        frt = await self.calculate_frt_p50(7)
+        containment = await self.calculate_containment_rate(7)
+
+        db = await get_connection(self.db_path)
+        await db.execute(
+            """
+            INSERT OR REPLACE INTO metrics_weekly (week_key, frt_p50, containment)
+            VALUES (?, ?, ?)
+            """,
+            (_week_key(0), frt, containment),
+        )
+        await db.commit()
 
     @beartype
     async def get_weekly_report(self, week_offset: int = 0) -> dict:
         """Получить еженедельный отчёт.
 
+        Метрики читаются из предрассчитанной таблицы metrics_weekly;
+        если записи для недели нет, они считаются по сырым событиям.
+
         Args:
             week_offset: Смещение недель (0=текущая, 1=прошлая)
 
         Returns:
             dict: Отчёт с метриками
         """
-        days = 7
-        frt = await self.calculate_frt_p50(days)
-        containment = await self.calculate_containment_rate(days)
+        week_key = _week_key(week_offset)
+
+        db = await get_connection(self.db_path)
+        rows = await db.execute_fetchall(
+            "SELECT frt_p50, containment FROM metrics_weekly WHERE week_key = ?",
+            (week_key,),
+        )
+
+        row = next(iter(rows), None)
+        if row is not None:
+            frt, containment = row
+        else:
+            # Роллап ещё не построен - считаем по сырым событиям
+            frt = await self.calculate_frt_p50(7)
+            containment = await self.calculate_containment_rate(7)
 
         return {
-            "period": f"{datetime.now().year}-W{datetime.now().isocalendar()[1] - week_offset}",
+            "period": week_key,
             "frt_p50_seconds": round(frt, 1),
             "containment_rate": round(containment, 2),
             "handoff_rate": round(1 - containment, 2),
         }
+
+
+def _week_key(week_offset: int) -> str:
+    """Ключ недели для отчётов и таблицы metrics_weekly (например, 2024-W07)."""
+    now = datetime.now()
+    return f"{now.year}-W{now.isocalendar()[1] - week_offset}"
@@ -2,23 +2,157 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import logging
 from datetime import datetime
 from pathlib import Path
 
-import aiosqlite
 from beartype import beartype
 
+from src.database.connection import get_connection
+
+logger = logging.getLogger(__name__)
+
+_INSERT_EVENT_SQL = """
+    INSERT INTO events (user_id, event_type, event_data, timestamp)
+    VALUES (?, ?, ?, ?)
+"""
+
+# (user_id, event_type, event_data); время события проставляется при записи пачки
+EventRow = tuple[int, str, str]
+
+# Энкодер создаётся один раз вместо нового JSONEncoder в каждом json.dumps
+_encode_event = json.JSONEncoder(ensure_ascii=False).encode
+
+# Готовый JSON для событий без данных - без вызова энкодера
+_EMPTY_EVENT_DATA = "{}"
+
+
+class _EventWriter:
+    """Фоновая пакетная запись событий в одну БД.
+
+    События копятся в очереди и записываются через executemany одной
+    транзакцией раз в FLUSH_INTERVAL или по достижении MAX_BATCH.
+    Все события пачки получают одно время записи - оно отстаёт от момента
+    события не больше чем на FLUSH_INTERVAL.
+    """
+
+    FLUSH_INTERVAL = 0.05  # секунды
+    MAX_BATCH = 500
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = db_path
+        self._queue: asyncio.Queue[EventRow] = asyncio.Queue()
+        # События, уже взятые из очереди, но ещё не отданные в запись
+        self._pending: list[EventRow] = []
+        # Запись, начатая фоновой задачей (доводится до конца и при её отмене)
+        self._writing: asyncio.Future[None] | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._write_lock = asyncio.Lock()
+
+    def put(self, row: EventRow) -> None:
+        """Поставить событие в очередь записи."""
+        self._queue.put_nowait(row)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def flush(self) -> None:
+        """Записать все накопленные события и дождаться уже начатой записи."""
+        while self._pending or not self._queue.empty():
+            await self._write(self._take_batch())
+        writing, self._writing = self._writing, None
+        if writing is not None:
+            for error in await asyncio.gather(writing, return_exceptions=True):
+                if isinstance(error, Exception):
+                    logger.error(f"Error writing events: {error}")
+
+    async def close(self) -> None:
+        """Остановить фоновую задачу и записать оставшиеся события."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        """Ждать события и записывать их пачками."""
+        while True:
+            # Событие сразу попадает в _pending: если задачу отменят во время
+            # паузы ниже, его допишет flush() из close()
+            self._pending.append(await self._queue.get())
+            if len(self._pending) + self._queue.qsize() < self.MAX_BATCH:
+                # Даём накопиться событиям соседних сообщений
+                await asyncio.sleep(self.FLUSH_INTERVAL)
+            # shield: отмена задачи не обрывает начатую транзакцию,
+            # flush() дожидается её через _writing
+            self._writing = asyncio.ensure_future(self._write(self._take_batch()))
+            try:
+                await asyncio.shield(self._writing)
+            except Exception as e:
+                logger.error(f"Error writing events: {e}")
+            self._writing = None
+
+    def _take_batch(self) -> list[EventRow]:
+        """Забрать отложенные события и добрать пачку из очереди."""
+        batch, self._pending = self._pending, []
+        batch.extend(self._drain(self.MAX_BATCH - len(batch)))
+        return batch
+
+    def _drain(self, limit: int = MAX_BATCH) -> list[EventRow]:
+        """Забрать из очереди до limit событий без ожидания."""
+        batch: list[EventRow] = []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _write(self, batch: list[EventRow]) -> None:
+        """Записать пачку событий одной транзакцией."""
+        if not batch:
+            return
+        # Одно форматирование времени на пачку вместо datetime.now() на событие
+        timestamp = datetime.now().isoformat()
+        async with self._write_lock:
+            db = await get_connection(self.db_path)
+            await db.executemany(
+                _INSERT_EVENT_SQL,
+                [(*row, timestamp) for row in batch],
+            )
+            await db.commit()
+
+
+_writers: dict[Path, _EventWriter] = {}
+
+
+def _get_writer(db_path: Path) -> _EventWriter:
+    """Получить общий writer событий для БД."""
+    writer = _writers.get(db_path)
+    if writer is None:
+        writer = _writers[db_path] = _EventWriter(db_path)
+    return writer
+
+
+async def close_event_writers() -> None:
+    """Записать накопленные события и остановить фоновые задачи (при остановке бота)."""
+    while _writers:
+        _, writer = _writers.popitem()
+        await writer.close()
+
 
 class EventLogger:
-    """Логгер событий для расчёта метрик."""
+    """Логгер событий для расчёта метрик.
+
+    Запись пакетная: log() ставит событие в очередь общего для БД writer'а,
+    в таблицу events оно попадает в течение _EventWriter.FLUSH_INTERVAL.
+    Методы, вызываемые на каждое сообщение, не обёрнуты в @beartype:
+    их типы проверяются статически (mypy strict).
+    """
 
     @beartype
     def __init__(self, db_path: Path) -> None:
         """Инициализация."""
         self.db_path = db_path
 
-    @beartype
     async def log(self, user_id: int, event_type: str, event_data: dict | None = None) -> None:
         """Записать событие.
 
@@ -27,39 +161,44 @@ class EventLogger:
             event_type: Тип события
             event_data: Дополнительные данные
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                """
-                INSERT INTO events (user_id, event_type, event_data, timestamp)
-                VALUES (?, ?, ?, ?)
-                """,
-                (
-                    user_id,
-                    event_type,
-                    json.dumps(event_data or {}, ensure_ascii=False),
-                    datetime.now().isoformat(),
-                ),
-            )
-            await db.commit()
+        self._log_raw(
+            user_id,
+            event_type,
+            _encode_event(event_data) if event_data else _EMPTY_EVENT_DATA,
+        )
+
+    def _log_raw(self, user_id: int, event_type: str, payload: str) -> None:
+        """Поставить в очередь событие с уже сериализованными данными.
+
+        Args:
+            user_id: ID пользователя
+            event_type: Тип события
+            payload: Данные события в JSON
+        """
+        _get_writer(self.db_path).put((user_id, event_type, payload))
+
+    async def flush(self) -> None:
+        """Дождаться записи всех поставленных в очередь событий."""
+        await _get_writer(self.db_path).flush()
 
-    @beartype
     async def log_conversation_started(self, user_id: int) -> None:
         """Записать начало диалога."""
         await self.log(user_id, "conversation_started")
 
-    @beartype
     async def log_first_bot_response(self, user_id: int, response_time_ms: float) -> None:
         """Записать первый ответ бота."""
-        await self.log(user_id, "first_bot_response", {"response_time_ms": response_time_ms})
+        # Данные фиксированной формы: JSON собирается строкой без словаря и энкодера
+        # (repr(float) совпадает с тем, как число записывает json)
+        self._log_raw(
+            user_id, "first_bot_response", f'{{"response_time_ms": {response_time_ms!r}}}'
+        )
 
-    @beartype
     async def log_intent_classified(self, user_id: int, intent: str, confidence: float) -> None:
         """Записать классификацию интента."""
         await self.log(
             user_id, "intent_classified", {"intent": intent, "confidence": confidence}
         )
 
-    @beartype
     async def log_funnel_stage_changed(self, user_id: int, old_stage: str, new_stage: str) -> None:
         """Записать изменение этапа воронки."""
         await self.log(
@@ -7,12 +7,15 @@
 
 from __future__ import annotations
 
+import re
+import sys
 from dataclasses import dataclass
 from enum import IntEnum
 from typing import TYPE_CHECKING
 
 from beartype import beartype
 from src.database.context import Message
+from src.utils.patterns import trie_pattern
 
 if TYPE_CHECKING:
     pass
@@ -40,6 +43,15 @@ class Intent:
     group: str  # Группа интента для логирования
 
 
+# Дефолтный интент, если ни одно ключевое слово не совпало
+_GENERAL_INTENT = Intent(
+    name="general",
+    priority=IntentPriority.NAVIGATION,
+    confidence=0.5,
+    group="navigation",
+)
+
+
 class IntentClassifier:
     """Классификатор интентов с каскадной приоритизацией."""
 
@@ -275,11 +287,36 @@ class IntentClassifier:
         # Собираем все интенты в один список для быстрого доступа
         self._all_intents = self._build_intent_registry()
 
-    def _build_intent_registry(self) -> list[tuple[str, IntentPriority, str, list[str]]]:
+        # Все ключевые слова компилируются в один автомат: текст сканируется
+        # один раз, а не отдельным поиском подстроки на каждое слово
+        keywords = {
+            kw for _, _, _, intent_keywords, _ in self._all_intents for kw in intent_keywords
+        }
+        self._keyword_scanner = re.compile(f"(?=({trie_pattern(keywords)}))")
+        # Автомат находит самое длинное слово в позиции; короткие слова,
+        # начинающиеся там же, являются его префиксами
+        self._keywords_at = {
+            kw: tuple(other for other in keywords if kw.startswith(other))
+            for kw in keywords
+        }
+        # Порог срабатывания по индексу реестра: супер-приоритетные интенты
+        # (безопасность, privacy, претензии) срабатывают при любом совпадении
+        self._min_confidence = tuple(
+            0.0 if priority <= IntentPriority.COMPLAINTS else 0.3
+            for _, priority, _, _, _ in self._all_intents
+        )
+        self._keyword_owners: dict[str, list[int]] = {}
+        for index, (_, _, _, intent_keywords, _) in enumerate(self._all_intents):
+            for kw in set(intent_keywords):
+                self._keyword_owners.setdefault(kw, []).append(index)
+
+    def _build_intent_registry(
+        self,
+    ) -> tuple[tuple[str, IntentPriority, str, tuple[str, ...], int], ...]:
         """Построить реестр всех интентов с их приоритетами.
 
         Returns:
-            list: [(intent_name, priority, group, keywords), ...]
+            tuple: ((intent_name, priority, group, keywords, keyword_count), ...)
         """
         registry = []
 
@@ -321,7 +358,18 @@ class IntentClassifier:
 
         # Сортируем по приоритету (от высшего к низшему)
         registry.sort(key=lambda x: x[1])
-        return registry
+        # Реестр неизменяемый; ключевые слова приводятся к нижнему регистру,
+        # как и текст, а число ключевых слов считается один раз
+        return tuple(
+            (
+                sys.intern(intent_name),
+                priority,
+                sys.intern(group),
+                tuple(keyword.lower() for keyword in keywords),
+                len(keywords),
+            )
+            for intent_name, priority, group, keywords in registry
+        )
 
     @beartype
     def classify(
@@ -341,64 +389,61 @@ class IntentClassifier:
         """
         text_lower = text.lower()
 
-        # Каскадная проверка по приоритетам
-        for intent_name, priority, group, keywords in self._all_intents:
-            confidence = self._calculate_confidence(text_lower, keywords)
-
-            if confidence > 0.0:
-                # Для супер-приоритетных интентов (безопасность, privacy, претензии)
-                # даже низкий confidence приводит к срабатыванию
-                if priority <= IntentPriority.COMPLAINTS:
-                    return Intent(
-                        name=intent_name,
-                        priority=priority,
-                        confidence=confidence,
-                        group=group,
-                    )
-
-                # Для остальных интентов требуем минимальный порог
-                if confidence >= 0.3:
-                    return Intent(
-                        name=intent_name,
-                        priority=priority,
-                        confidence=confidence,
-                        group=group,
-                    )
+        # Один проход автомата по тексту: все встретившиеся ключевые слова
+        found: set[str] = set()
+        for match in self._keyword_scanner.finditer(text_lower):
+            found.update(self._keywords_at[match.group(1)])
+
+        # Число различных совпавших ключевых слов по каждому интенту
+        matches_by_intent: dict[int, int] = {}
+        for keyword in found:
+            for index in self._keyword_owners[keyword]:
+                matches_by_intent[index] = matches_by_intent.get(index, 0) + 1
+
+        if not matches_by_intent:
+            return _GENERAL_INTENT
+
+        # Длина текста нужна для бонуса и считается один раз на сообщение
+        is_short = len(text_lower.split()) <= 5
+
+        # Каскадная проверка по приоритетам - только среди интентов с совпадениями:
+        # реестр отсортирован по приоритету, поэтому порядок индексов и есть каскад
+        for index in sorted(matches_by_intent):
+            intent_name, priority, group, _, keyword_count = self._all_intents[index]
+            confidence = self._calculate_confidence(
+                matches_by_intent[index], keyword_count, is_short
+            )
+
+            # Для супер-приоритетных интентов порог нулевой, для остальных - 0.3
+            if confidence >= self._min_confidence[index]:
+                return Intent(
+                    name=intent_name,
+                    priority=priority,
+                    confidence=confidence,
+                    group=group,
+                )
 
         # Если ничего не найдено - возвращаем дефолтный интент "general"
-        return Intent(
-            name="general",
-            priority=IntentPriority.NAVIGATION,
-            confidence=0.5,
-            group="navigation",
-        )
+        return _GENERAL_INTENT
 
-    @beartype
-    def _calculate_confidence(self, text_lower: str, keywords: list[str]) -> float:
+    def _calculate_confidence(
+        self, matches: int, total_keywords: int, is_short: bool
+    ) -> float:
         """Рассчитать уверенность совпадения с ключевыми словами.
 
         Args:
-            text_lower: Текст в нижнем регистре
-            keywords: Список ключевых слов интента
+            matches: Число совпавших ключевых слов интента (больше нуля)
+            total_keywords: Общее число ключевых слов интента
+            is_short: Текст не длиннее пяти слов
 
         Returns:
             float: Уверенность от 0.0 до 1.0
         """
-        matches = 0
-        total_keywords = len(keywords)
-
-        for keyword in keywords:
-            if keyword in text_lower:
-                matches += 1
-
-        if matches == 0:
-            return 0.0
-
         # Базовая confidence - доля совпавших keywords
         confidence = matches / total_keywords
 
         # Бонус если текст короткий и точный
-        if len(text_lower.split()) <= 5 and matches > 0:
+        if is_short:
             confidence = min(confidence + 0.3, 1.0)
 
         return confidence
@@ -17,7 +17,7 @@ if TYPE_CHECKING:
     pass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SlotValue:
     """Значение слота с метаданными."""
 
@@ -27,38 +27,38 @@ class SlotValue:
     extracted_from: str  # Откуда извлечено
 
 
-@dataclass
+@dataclass(slots=True)
 class SlotCollection:
-    """Коллекция извлечённых слотов."""
+    """Коллекция извлечённых слотов.
+
+    Методы-геттеры вызываются на каждое сообщение и не обёрнуты в @beartype:
+    их типы проверяются статически (mypy strict).
+    """
 
     slots: dict[str, SlotValue] = field(default_factory=dict)
     required_slots: list[str] = field(default_factory=list)
 
-    @beartype
     def is_complete(self) -> bool:
         """Проверить заполнены ли все обязательные слоты."""
-        for slot_name in self.required_slots:
-            if slot_name not in self.slots or self.slots[slot_name].value is None:
-                return False
-        return True
+        # Один поиск в словаре на слот; остановка на первом незаполненном
+        return not any(
+            (slot := self.slots.get(slot_name)) is None or slot.value is None
+            for slot_name in self.required_slots
+        )
 
-    @beartype
     def get_missing_slots(self) -> list[str]:
         """Получить список незаполненных обязательных слотов."""
-        missing = []
-        for slot_name in self.required_slots:
-            if slot_name not in self.slots or self.slots[slot_name].value is None:
-                missing.append(slot_name)
-        return missing
+        return [
+            slot_name
+            for slot_name in self.required_slots
+            if (slot := self.slots.get(slot_name)) is None or slot.value is None
+        ]
 
-    @beartype
     def get_value(self, slot_name: str) -> str | None:
         """Получить значение слота."""
-        if slot_name in self.slots:
-            return self.slots[slot_name].value
-        return None
+        slot = self.slots.get(slot_name)
+        return slot.value if slot is not None else None
 
-    @beartype
     def set_value(self, slot_name: str, value: str, confidence: float = 1.0) -> None:
         """Установить значение слота."""
         self.slots[slot_name] = SlotValue(
@@ -69,6 +69,33 @@ class SlotCollection:
         )
 
 
+# Простые паттерны целей (в порядке приоритета): ключевые слова каждой цели
+# собраны в одну альтернацию, чтобы проверять цель одним поиском
+_GOAL_PATTERNS = tuple(
+    (goal_name, re.compile("|".join(map(re.escape, keywords))))
+    for goal_name, keywords in {
+        "консультация": ["консультация", "посоветовать", "помочь разобраться"],
+        "разработка": ["разработать", "создать", "сделать сайт", "приложение"],
+        "поддержка": [
+            "поддержка",
+            "сопровождение",
+            "обслуживание",
+            "техподдержка",
+        ],
+        "автоматизация": ["автоматизировать", "автоматизация", "оптимизировать"],
+    }.items()
+)
+
+
+def _any_of(patterns: tuple[re.Pattern[str], ...], flags: int = 0) -> re.Pattern[str]:
+    """Объединить паттерны в одну альтернацию для быстрой проверки «есть ли совпадение».
+
+    Порядок приоритета паттернов альтернация не сохраняет (побеждает самое левое
+    совпадение), поэтому значение слота по-прежнему ищется перебором списка.
+    """
+    return re.compile("|".join(pattern.pattern for pattern in patterns), flags)
+
+
 class SlotExtractor:
     """Экстрактор слотов из текста."""
 
@@ -89,43 +116,86 @@ class SlotExtractor:
         "consent_flag",
     ]
 
-    # Паттерны для извлечения
-
-    # Order ID паттерны
-    ORDER_ID_PATTERNS = [
-        r"заказ\s*№?\s*(\d+)",
-        r"заказа?\s*(\d+)",
-        r"номер\s*(\d+)",
-        r"#(\d+)",
-    ]
-
-    # Budget паттерны
-    BUDGET_PATTERNS = [
-        r"(\d+)\s*(?:руб|рублей|тысяч|тыс|к)",
-        r"бюджет\s*(\d+)",
-        r"до\s*(\d+)",
-        r"около\s*(\d+)",
-    ]
-
-    # Deadline паттерны
-    DEADLINE_PATTERNS = [
-        r"через\s+(\d+)\s+(?:день|дня|дней|неделю|недели|недель|месяц|месяца|месяцев)",
-        r"до\s+(\d+)",
-        r"срочно",
-        r"как можно скорее",
-        r"сегодня",
-        r"завтра",
-    ]
+    # Категория по имени слота (для get_slot_category)
+    _CATEGORY_OF = {
+        **{slot_name: "result" for slot_name in RESULT_SLOTS},
+        **{slot_name: "constraint" for slot_name in CONSTRAINT_SLOTS},
+        **{slot_name: "operational" for slot_name in OPERATIONAL_SLOTS},
+    }
+
+    # Вопросы для каждого типа слота
+    _QUESTIONS = {
+        "goal": "Какая у вас цель? Что именно нужно сделать?",
+        "desired_outcome": "Какой результат хотите получить?",
+        "requested_item": "Что именно вас интересует из наших услуг?",
+        "deadline": "Когда нужно? Есть ли срок?",
+        "budget_band": "Какой у вас бюджет? Хотя бы примерно.",
+        "location": "Где находитесь? В каком городе?",
+        "constraints": "Есть ли какие-то обязательные условия или ограничения?",
+        "quantity": "Какой объём работ? Сколько нужно?",
+        "contact": "Оставьте контакт для связи (телефон или email).",
+        "order_id": "Напишите номер заказа.",
+    }
+
+    # Паттерны для извлечения (компилируются один раз при импорте модуля)
+
+    # Order ID паттерны (применяются к тексту в нижнем регистре: поиск
+    # без IGNORECASE быстрее, а номер заказа состоит из цифр)
+    ORDER_ID_PATTERNS = tuple(
+        re.compile(pattern)
+        for pattern in (
+            r"заказ\s*№?\s*(\d+)",
+            r"заказа?\s*(\d+)",
+            r"номер\s*(\d+)",
+            r"#(\d+)",
+        )
+    )
+
+    # Budget паттерны (применяются к тексту в нижнем регистре)
+    BUDGET_PATTERNS = tuple(
+        re.compile(pattern)
+        for pattern in (
+            r"(\d+)\s*(?:руб|рублей|тысяч|тыс|к)",
+            r"бюджет\s*(\d+)",
+            r"до\s*(\d+)",
+            r"около\s*(\d+)",
+        )
+    )
+
+    # Deadline паттерны (применяются к тексту в нижнем регистре, в порядке приоритета)
+    DEADLINE_PATTERNS = tuple(
+        re.compile(pattern)
+        for pattern in (
+            r"срочно",
+            r"сегодня",
+            r"завтра",
+            r"через\s+\d+\s+(?:день|дня|дней|неделю|недели|недель|месяц|месяца|месяцев)",
+            r"до\s+\d+",
+            r"как можно скорее",
+        )
+    )
 
     # Contact паттерны
-    PHONE_PATTERNS = [
-        r"\+?7\s*\(?\d{3}\)?\s*\d{3}-?\d{2}-?\d{2}",
-        r"8\s*\(?\d{3}\)?\s*\d{3}-?\d{2}-?\d{2}",
-    ]
+    PHONE_PATTERNS = tuple(
+        re.compile(pattern)
+        for pattern in (
+            r"\+?7\s*\(?\d{3}\)?\s*\d{3}-?\d{2}-?\d{2}",
+            r"8\s*\(?\d{3}\)?\s*\d{3}-?\d{2}-?\d{2}",
+        )
+    )
 
-    EMAIL_PATTERNS = [
-        r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
-    ]
+    EMAIL_PATTERNS = (
+        re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"),
+    )
+
+    # Объединённые паттерны: в большинстве сообщений слотов нет, и тогда
+    # хватает одного прохода по тексту вместо перебора всех паттернов.
+    # Общий паттерн на все слоты сразу не быстрее: у разнородной альтернации
+    # нет общего префикса, и движок re проверяет каждую ветку в каждой позиции
+    ORDER_ID_ANY = _any_of(ORDER_ID_PATTERNS)
+    BUDGET_ANY = _any_of(BUDGET_PATTERNS)
+    DEADLINE_ANY = _any_of(DEADLINE_PATTERNS)
+    CONTACT_ANY = _any_of(PHONE_PATTERNS + EMAIL_PATTERNS)
 
     @beartype
     def __init__(self) -> None:
@@ -154,7 +224,7 @@ class SlotExtractor:
         text_lower = text.lower()
 
         # Извлечение order_id
-        order_id = self._extract_order_id(text)
+        order_id = self._extract_order_id(text_lower)
         if order_id:
             collection.slots["order_id"] = SlotValue(
                 name="order_id",
@@ -206,10 +276,13 @@ class SlotExtractor:
         return collection
 
     @beartype
-    def _extract_order_id(self, text: str) -> str | None:
+    def _extract_order_id(self, text_lower: str) -> str | None:
         """Извлечь номер заказа."""
+        if not self.ORDER_ID_ANY.search(text_lower):
+            return None
+
         for pattern in self.ORDER_ID_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
+            match = pattern.search(text_lower)
             if match:
                 return match.group(1) if match.groups() else match.group(0)
         return None
@@ -217,12 +290,16 @@ class SlotExtractor:
     @beartype
     def _extract_budget(self, text_lower: str) -> str | None:
         """Извлечь бюджет."""
+        if not self.BUDGET_ANY.search(text_lower):
+            return None
+
         for pattern in self.BUDGET_PATTERNS:
-            match = re.search(pattern, text_lower)
+            match = pattern.search(text_lower)
             if match:
                 amount = match.group(1)
                 # Определить единицу измерения
-                if "тысяч" in text_lower or "тыс" in text_lower or "к" in text_lower:
+                # "тысяч" содержит "тыс", отдельная проверка не нужна
+                if "тыс" in text_lower or "к" in text_lower:
                     return f"{amount}000 руб"
                 return f"{amount} руб"
         return None
@@ -230,15 +307,11 @@ class SlotExtractor:
     @beartype
     def _extract_deadline(self, text_lower: str) -> str | None:
         """Извлечь срок."""
-        if "срочно" in text_lower:
-            return "срочно"
-        if "сегодня" in text_lower:
-            return "сегодня"
-        if "завтра" in text_lower:
-            return "завтра"
+        if not self.DEADLINE_ANY.search(text_lower):
+            return None
 
         for pattern in self.DEADLINE_PATTERNS:
-            match = re.search(pattern, text_lower)
+            match = pattern.search(text_lower)
             if match:
                 return match.group(0)
 
@@ -247,15 +320,18 @@ class SlotExtractor:
     @beartype
     def _extract_contact(self, text: str) -> str | None:
         """Извлечь контакт (телефон или email)."""
+        if not self.CONTACT_ANY.search(text):
+            return None
+
         # Проверка телефона
         for pattern in self.PHONE_PATTERNS:
-            match = re.search(pattern, text)
+            match = pattern.search(text)
             if match:
                 return match.group(0)
 
         # Проверка email
         for pattern in self.EMAIL_PATTERNS:
-            match = re.search(pattern, text)
+            match = pattern.search(text)
             if match:
                 return match.group(0)
 
@@ -266,21 +342,8 @@ class SlotExtractor:
         self, text_lower: str, conversation_history: list[Message] | None
     ) -> str | None:
         """Извлечь цель (простая эвристика на основе keywords)."""
-        # Простые паттерны целей
-        goal_patterns = {
-            "консультация": ["консультация", "посоветовать", "помочь разобраться"],
-            "разработка": ["разработать", "создать", "сделать сайт", "приложение"],
-            "поддержка": [
-                "поддержка",
-                "сопровождение",
-                "обслуживание",
-                "техподдержка",
-            ],
-            "автоматизация": ["автоматизировать", "автоматизация", "оптимизировать"],
-        }
-
-        for goal_name, keywords in goal_patterns.items():
-            if any(keyword in text_lower for keyword in keywords):
+        for goal_name, pattern in _GOAL_PATTERNS:
+            if pattern.search(text_lower):
                 return goal_name
 
         return None
@@ -303,34 +366,17 @@ class SlotExtractor:
         # Берём первый недостающий слот
         next_slot = missing[0]
 
-        # Вопросы для каждого типа слота
-        questions = {
-            "goal": "Какая у вас цель? Что именно нужно сделать?",
-            "desired_outcome": "Какой результат хотите получить?",
-            "requested_item": "Что именно вас интересует из наших услуг?",
-            "deadline": "Когда нужно? Есть ли срок?",
-            "budget_band": "Какой у вас бюджет? Хотя бы примерно.",
-            "location": "Где находитесь? В каком городе?",
-            "constraints": "Есть ли какие-то обязательные условия или ограничения?",
-            "quantity": "Какой объём работ? Сколько нужно?",
-            "contact": "Оставьте контакт для связи (телефон или email).",
-            "order_id": "Напишите номер заказа.",
-        }
-
-        question = questions.get(next_slot, f"Уточните: {next_slot}")
-
         # Если несколько слотов - можем объединить в один вопрос
         if len(missing) > 1:
             # Объединяем до 3 вопросов максимум
-            combined_questions = []
-            for slot in missing[:3]:
-                if slot in questions:
-                    combined_questions.append(questions[slot])
+            picked = [
+                self._QUESTIONS[slot] for slot in missing[:3] if slot in self._QUESTIONS
+            ]
 
-            if len(combined_questions) > 1:
-                return f"{combined_questions[0]} И {combined_questions[1].lower()}"
+            if len(picked) > 1:
+                return f"{picked[0]} И {picked[1].lower()}"
 
-        return question
+        return self._QUESTIONS.get(next_slot, f"Уточните: {next_slot}")
 
     @beartype
     def validate_slot(self, slot_name: str, value: str) -> tuple[bool, str]:
@@ -348,13 +394,9 @@ class SlotExtractor:
             if not value:
                 return False, "Контакт не может быть пустым"
 
-            # Проверка телефона или email
-            is_phone = any(
-                re.match(pattern, value) for pattern in self.PHONE_PATTERNS
-            )
-            is_email = any(
-                re.match(pattern, value) for pattern in self.EMAIL_PATTERNS
-            )
+            # Проверка телефона или email: значение должно совпадать целиком
+            is_phone = any(pattern.fullmatch(value) for pattern in self.PHONE_PATTERNS)
+            is_email = any(pattern.fullmatch(value) for pattern in self.EMAIL_PATTERNS)
 
             if not is_phone and not is_email:
                 return False, "Укажите корректный телефон или email"
@@ -381,10 +423,4 @@ class SlotExtractor:
         Returns:
             str: Категория (result/constraint/operational)
         """
-        if slot_name in self.RESULT_SLOTS:
-            return "result"
-        elif slot_name in self.CONSTRAINT_SLOTS:
-            return "constraint"
-        elif slot_name in self.OPERATIONAL_SLOTS:
-            return "operational"
-        return "unknown"
+        return self._CATEGORY_OF.get(slot_name, "unknown")
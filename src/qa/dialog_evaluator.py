@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
 
 from beartype import beartype
 
 
-@dataclass
+@dataclass(slots=True)
 class DialogScore:
     """Оценка диалога."""
 
@@ -39,6 +40,10 @@ STOP_ERRORS = [
     "argued_with_complaint",  # Спор с клиентом в претензии
 ]
 
+# Паттерны правил: IGNORECASE вместо копирования текста через .lower()
+_PRIVACY_TRIGGER_RE = re.compile("удалите данные", re.IGNORECASE)
+_PRIVACY_ACK_RE = re.compile("регистр", re.IGNORECASE)
+
 
 @beartype
 def has_stop_error(dialog_text: str, bot_response: str) -> tuple[bool, str | None]:
@@ -53,13 +58,11 @@ def has_stop_error(dialog_text: str, bot_response: str) -> tuple[bool, str | Non
     """
     # Упрощённая проверка (в production нужны более сложные правила)
 
-    # Проверка на выдумку цены
-    if "руб" in bot_response and "от" not in bot_response and "до" not in bot_response:
-        # Может быть точная цена без "от" или "до" - это подозрительно
-        pass
+    # Проверка на выдумку цены (точная цена без "от" или "до") пока не является
+    # стоп-ошибкой, поэтому ответ на неё не сканируется
 
     # Проверка на игнор privacy request
-    if "удалите данные" in dialog_text.lower() and "регистр" not in bot_response.lower():
+    if _PRIVACY_TRIGGER_RE.search(dialog_text) and not _PRIVACY_ACK_RE.search(bot_response):
         return True, "ignored_privacy_request"
 
     return False, None
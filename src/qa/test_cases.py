@@ -3,11 +3,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Final
 
 from beartype import beartype
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TestCase:
     """Тест-кейс для проверки бота."""
 
@@ -19,7 +20,7 @@ class TestCase:
 
 
 # Минимальный набор тест-кейсов (60-120 по стандарту, здесь 20 для примера)
-TEST_CASES = [
+TEST_CASES: Final[tuple[TestCase, ...]] = (
     # Pricing
     TestCase(
         id="TC001",
@@ -93,27 +94,37 @@ TEST_CASES = [
         expected_intent="comparison",
         expected_behavior="показать преимущества без спора, спросить важные критерии",
     ),
-]
+)
+
+# Индекс тест-кейсов по ожидаемому интенту (строится один раз при импорте;
+# кортежи, чтобы вызывающий код не мог испортить общий индекс)
+_by_intent: dict[str, list[TestCase]] = {}
+for _test_case in TEST_CASES:
+    _by_intent.setdefault(_test_case.expected_intent, []).append(_test_case)
+_BY_INTENT: Final[dict[str, tuple[TestCase, ...]]] = {
+    intent: tuple(cases) for intent, cases in _by_intent.items()
+}
+del _test_case, _by_intent
 
 
 @beartype
-def get_test_cases_by_intent(intent: str) -> list[TestCase]:
+def get_test_cases_by_intent(intent: str) -> tuple[TestCase, ...]:
     """Получить тест-кейсы для конкретного интента.
 
     Args:
         intent: Интент
 
     Returns:
-        list[TestCase]: Список тест-кейсов
+        tuple[TestCase, ...]: Тест-кейсы интента
     """
-    return [tc for tc in TEST_CASES if tc.expected_intent == intent]
+    return _BY_INTENT.get(intent, ())
 
 
 @beartype
-def get_all_test_cases() -> list[TestCase]:
+def get_all_test_cases() -> tuple[TestCase, ...]:
     """Получить все тест-кейсы.
 
     Returns:
-        list[TestCase]: Все тест-кейсы
+        tuple[TestCase, ...]: Все тест-кейсы
     """
     return TEST_CASES
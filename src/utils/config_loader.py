@@ -19,7 +19,44 @@ class ConfigError(Exception):
 
 @beartype
 class BotConfig:
-    """Конфигурация бота."""
+    """Конфигурация бота.
+
+    Часто читаемые значения вычисляются один раз при загрузке и хранятся
+    в слотах, а не извлекаются из словаря при каждом обращении.
+    """
+
+    __slots__ = (
+        "config_path",
+        "_data",
+        "company_name",
+        "company_phone",
+        "company_email",
+        "company_telegram",
+        "welcome_message",
+        "ai_model",
+        "ai_temperature",
+        "ai_max_tokens",
+        "ai_context_messages",
+        "quick_faq_enabled",
+        "streaming_enabled",
+        "faq_quick_threshold",
+        "faq_search_threshold",
+    )
+
+    # Удобные геттеры
+    company_name: str  # Название компании
+    company_phone: str  # Телефон компании
+    company_email: str  # Email компании
+    company_telegram: str  # Telegram компании
+    welcome_message: str  # Приветственное сообщение (с подставленным названием)
+    ai_model: str  # Модель AI
+    ai_temperature: float  # Температура AI
+    ai_max_tokens: int  # Максимальное количество токенов
+    ai_context_messages: int  # Количество сообщений в контексте
+    quick_faq_enabled: bool  # Включена ли быстрая проверка FAQ
+    streaming_enabled: bool  # Включен ли streaming
+    faq_quick_threshold: float  # Порог для быстрой проверки FAQ
+    faq_search_threshold: float  # Порог для поиска FAQ
     
     def __init__(self, config_path: str | Path = "config.json") -> None:
         """Инициализация конфигурации.
@@ -34,12 +71,12 @@ class BotConfig:
         self._data: dict[str, Any] = {}
         self._load()
         self._validate()
+        self._freeze()
     
     def _load(self) -> None:
-        """Загрузить конфигурацию из файла."""
+        """Загрузить конфигурацию из файла (одно чтение и разбор байтов)."""
         try:
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                self._data = json.load(f)
+            self._data = json.loads(self.config_path.read_bytes())
             logger.info(f"Configuration loaded from {self.config_path}")
         except FileNotFoundError:
             raise ConfigError(f"Configuration file not found: {self.config_path}")
@@ -78,73 +115,32 @@ class BotConfig:
             raise ConfigError("FAQ quick_check_threshold must be between 0.0 and 1.0")
         if not 0.0 <= faq.get("search_threshold", 0) <= 1.0:
             raise ConfigError("FAQ search_threshold must be between 0.0 and 1.0")
-    
-    # Удобные геттеры
-    @property
-    def company_name(self) -> str:
-        """Название компании."""
-        return self._data["company"]["name"]
-    
-    @property
-    def company_phone(self) -> str:
-        """Телефон компании."""
-        return self._data["company"]["phone"]
-    
-    @property
-    def company_email(self) -> str:
-        """Email компании."""
-        return self._data["company"]["email"]
-    
-    @property
-    def company_telegram(self) -> str:
-        """Telegram компании."""
-        return self._data["company"]["telegram"]
-    
-    @property
-    def welcome_message(self) -> str:
-        """Приветственное сообщение."""
-        msg = self._data["bot"]["welcome_message"]
-        return msg.format(company_name=self.company_name)
-    
-    @property
-    def ai_model(self) -> str:
-        """Модель AI."""
-        return self._data["ai"]["model"]
-    
-    @property
-    def ai_temperature(self) -> float:
-        """Температура AI."""
-        return self._data["ai"]["temperature"]
-    
-    @property
-    def ai_max_tokens(self) -> int:
-        """Максимальное количество токенов."""
-        return self._data["ai"]["max_tokens"]
-    
-    @property
-    def ai_context_messages(self) -> int:
-        """Количество сообщений в контексте."""
-        return self._data["ai"]["context_messages"]
-    
-    @property
-    def quick_faq_enabled(self) -> bool:
-        """Включена ли быстрая проверка FAQ."""
-        return self._data["features"]["quick_faq"]
-    
-    @property
-    def streaming_enabled(self) -> bool:
-        """Включен ли streaming."""
-        return self._data["features"]["streaming"]
-    
-    @property
-    def faq_quick_threshold(self) -> float:
-        """Порог для быстрой проверки FAQ."""
-        return self._data["faq"]["quick_check_threshold"]
-    
-    @property
-    def faq_search_threshold(self) -> float:
-        """Порог для поиска FAQ."""
-        return self._data["faq"]["search_threshold"]
+
+    def _freeze(self) -> None:
+        """Вычислить значения геттеров один раз после валидации."""
+        company = self._data["company"]
+        bot = self._data["bot"]
+        ai = self._data["ai"]
+        features = self._data["features"]
+        faq = self._data["faq"]
+        try:
+            self.company_name = company["name"]
+            self.company_phone = company["phone"]
+            self.company_email = company["email"]
+            self.company_telegram = company["telegram"]
+            self.welcome_message = bot["welcome_message"].format(
+                company_name=self.company_name
+            )
+            self.ai_model = ai["model"]
+            self.ai_temperature = ai["temperature"]
+            self.ai_max_tokens = ai["max_tokens"]
+            self.ai_context_messages = ai["context_messages"]
+            self.quick_faq_enabled = features["quick_faq"]
+            self.streaming_enabled = features["streaming"]
+            self.faq_quick_threshold = faq["quick_check_threshold"]
+            self.faq_search_threshold = faq["search_threshold"]
+        except KeyError as e:
+            raise ConfigError(f"Missing required field: {e.args[0]}")
     
     def get(self, key: str, default: Any = None) -> Any:
         """Получить значение из конфигурации.
@@ -166,3 +162,4 @@ class BotConfig:
             else:
                 return default
         return value
+
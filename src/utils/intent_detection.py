@@ -2,10 +2,56 @@
 
 from __future__ import annotations
 
-from beartype import beartype
+import re
+
+# Ключевые слова намерений в порядке приоритета. Слова каждого намерения
+# собраны в одну альтернацию: одна проверка на намерение вместо цикла по словам
+_INTENT_PATTERNS = tuple(
+    (intent, re.compile("|".join(map(re.escape, keywords))))
+    for intent, keywords in (
+        # Вопросы о ценах и стоимости
+        (
+            "pricing",
+            [
+                "сколько", "цена", "стоимость", "стоит", "расценки", "тариф",
+                "прайс", "оплата", "бесплатно", "дорого", "дешево", "цены"
+            ],
+        ),
+        # Вопросы об услугах
+        (
+            "services",
+            [
+                "услуга", "услуги", "делаете", "предлагаете", "сервис",
+                "что вы", "чем занимаетесь", "направления", "работы"
+            ],
+        ),
+        # Вопросы о контактах и связи
+        (
+            "contacts",
+            [
+                "связаться", "контакт", "телефон", "email", "почта", "адрес",
+                "где находитесь", "как найти", "telegram", "написать", "позвонить"
+            ],
+        ),
+        # Намерение заказать/купить
+        (
+            "order",
+            [
+                "заказать", "купить", "оформить", "нужна", "нужно", "хочу заказать",
+                "готов заказать", "интересует", "подать заявку"
+            ],
+        ),
+    )
+)
+
+
+# Намерения с конкретным вопросом - подсказки после ответа не нужны
+_HINT_SKIP_INTENTS = frozenset({"pricing", "services", "contacts", "order"})
+
+# Контакты в ответе бота (без копии текста через .lower())
+_CONTACTS_IN_RESPONSE_RE = re.compile("телефон|email|telegram|@", re.IGNORECASE)
 
 
-@beartype
 def detect_user_intent(text: str) -> str:
     """Определить намерение пользователя по тексту сообщения.
 
@@ -17,43 +63,14 @@ def detect_user_intent(text: str) -> str:
     """
     text_lower = text.lower()
 
-    # Вопросы о ценах и стоимости
-    pricing_keywords = [
-        "сколько", "цена", "стоимость", "стоит", "расценки", "тариф",
-        "прайс", "оплата", "бесплатно", "дорого", "дешево", "цены"
-    ]
-    if any(keyword in text_lower for keyword in pricing_keywords):
-        return "pricing"
-
-    # Вопросы об услугах
-    services_keywords = [
-        "услуга", "услуги", "делаете", "предлагаете", "сервис",
-        "что вы", "чем занимаетесь", "направления", "работы"
-    ]
-    if any(keyword in text_lower for keyword in services_keywords):
-        return "services"
-
-    # Вопросы о контактах и связи
-    contacts_keywords = [
-        "связаться", "контакт", "телефон", "email", "почта", "адрес",
-        "где находитесь", "как найти", "telegram", "написать", "позвонить"
-    ]
-    if any(keyword in text_lower for keyword in contacts_keywords):
-        return "contacts"
-
-    # Намерение заказать/купить
-    order_keywords = [
-        "заказать", "купить", "оформить", "нужна", "нужно", "хочу заказать",
-        "готов заказать", "интересует", "подать заявку"
-    ]
-    if any(keyword in text_lower for keyword in order_keywords):
-        return "order"
+    for intent, pattern in _INTENT_PATTERNS:
+        if pattern.search(text_lower):
+            return intent
 
     # По умолчанию - общий контекст
     return "general"
 
 
-@beartype
 def should_show_hints(response_text: str, intent: str) -> bool:
     """Определить нужно ли показывать подсказки после ответа.
 
@@ -64,22 +81,22 @@ def should_show_hints(response_text: str, intent: str) -> bool:
     Returns:
         bool: True если нужно показать подсказки
     """
-    # НЕ показываем hints если:
+    # НЕ показываем hints если (дешёвые проверки идут первыми):
     
     # 1. Ответ короткий (простое подтверждение)
     if len(response_text) < 50:
         return False
     
-    # 2. Уже есть контакты/телефон
-    if any(word in response_text.lower() for word in ["телефон", "email", "telegram", "@"]):
+    # 2. Клиент задал конкретный вопрос (pricing, services, contacts, order)
+    if intent in _HINT_SKIP_INTENTS:
         return False
     
     # 3. Есть список с маркерами (уже структурированный ответ)
     if "•" in response_text or "\n-" in response_text:
         return False
     
-    # 4. Клиент задал конкретный вопрос (pricing, services, contacts, order)
-    if intent in ["pricing", "services", "contacts", "order"]:
+    # 4. Уже есть контакты/телефон
+    if _CONTACTS_IN_RESPONSE_RE.search(response_text):
         return False
     
     # Показываем ТОЛЬКО для очень общих вопросов типа "привет"
@@ -2,12 +2,64 @@
 
 from __future__ import annotations
 
+import re
+
 from beartype import beartype
 
 from src.database.context import Message
 
 
-@beartype
+def _keywords_pattern(*keywords: str) -> re.Pattern[str]:
+    """Собрать ключевые слова в одну альтернацию для проверки одним поиском."""
+    return re.compile("|".join(map(re.escape, keywords)))
+
+
+# Намерения с конкретным интересом к услугам
+_INTEREST_INTENTS = frozenset({"pricing", "services", "order"})
+
+# Сильные сигналы покупки
+_HOT_KEYWORDS_RE = _keywords_pattern(
+    "заказать",
+    "купить",
+    "начать",
+    "оформить",
+    "записаться",
+    "хочу заказать",
+    "готов заказать",
+    "когда начнем",
+    "договор",
+    "подать заявку",
+    "оплатить",
+    "где оплата",
+)
+
+# Средние сигналы интереса
+_WARM_KEYWORDS_RE = _keywords_pattern(
+    "цена",
+    "стоимость",
+    "срок",
+    "как работает",
+    "гарантия",
+    "результат",
+    "кейс",
+    "пример",
+    "отзыв",
+    "портфолио",
+    "опыт",
+    "сколько стоит",
+)
+
+# Вопросы о конкретных деталях
+_DETAIL_KEYWORDS_RE = _keywords_pattern(
+    "для меня",
+    "в моем случае",
+    "мой проект",
+    "моя задача",
+    "мне нужно",
+    "у меня",
+)
+
+
 def calculate_lead_score(
     user_message: str,
     conversation_history: list[Message],
@@ -27,43 +79,15 @@ def calculate_lead_score(
     message_lower = user_message.lower()
 
     # Сильные сигналы покупки (+4 балла)
-    hot_keywords = [
-        "заказать",
-        "купить",
-        "начать",
-        "оформить",
-        "записаться",
-        "хочу заказать",
-        "готов заказать",
-        "когда начнем",
-        "договор",
-        "подать заявку",
-        "оплатить",
-        "где оплата",
-    ]
-    if any(kw in message_lower for kw in hot_keywords):
+    if _HOT_KEYWORDS_RE.search(message_lower):
         score += 4
 
     # Средние сигналы интереса (+2 балла)
-    warm_keywords = [
-        "цена",
-        "стоимость",
-        "срок",
-        "как работает",
-        "гарантия",
-        "результат",
-        "кейс",
-        "пример",
-        "отзыв",
-        "портфолио",
-        "опыт",
-        "сколько стоит",
-    ]
-    if any(kw in message_lower for kw in warm_keywords):
+    if _WARM_KEYWORDS_RE.search(message_lower):
         score += 2
 
     # Конкретные намерения (+2 балла)
-    if intent in ["pricing", "services", "order"]:
+    if intent in _INTEREST_INTENTS:
         score += 2
     elif intent == "contacts":
         score += 3  # Хочет связаться = горячий
@@ -79,16 +103,12 @@ def calculate_lead_score(
     if len(user_message) > 50:
         score += 1
 
+    # Максимум уже набран: поиск деталей ничего не изменит
+    if score >= 10:
+        return 10
+
     # Вопросы о конкретных деталях (+1 балл)
-    detail_keywords = [
-        "для меня",
-        "в моем случае",
-        "мой проект",
-        "моя задача",
-        "мне нужно",
-        "у меня",
-    ]
-    if any(kw in message_lower for kw in detail_keywords):
+    if _DETAIL_KEYWORDS_RE.search(message_lower):
         score += 1
 
     return min(score, 10)  # Максимум 10
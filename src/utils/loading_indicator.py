@@ -3,11 +3,14 @@
 from __future__ import annotations
 
 import asyncio
+import logging
 from datetime import datetime
 
 from aiogram.types import Message
 from beartype import beartype
 
+logger = logging.getLogger(__name__)
+
 
 class LoadingIndicator:
     """Управляет индикацией процесса генерации ответа."""
@@ -33,6 +36,16 @@ class LoadingIndicator:
     TIMEOUT_MESSAGE = "Генерация заняла много времени... Переключаюсь на базу знаний 🔍"
     FALLBACK_MESSAGE = "Ищу в базе знаний 📚"
 
+    # Текст для именованных фаз update_phase
+    _PHASE_TEXTS = {"timeout": TIMEOUT_MESSAGE, "fallback": FALLBACK_MESSAGE}
+
+    # Минимальный интервал между редактированиями сообщения (лимиты Telegram)
+    MIN_EDIT_INTERVAL = 1.0  # секунды
+
+    # Задержка первого typing indicator и период его повторной отправки
+    TYPING_DELAY = 1.0  # секунды
+    TYPING_INTERVAL = 5.0  # секунды
+
     def __init__(
         self,
         message: Message,
@@ -51,6 +64,10 @@ class LoadingIndicator:
         self.start_time = start_time
         self._stopped = False
         self._tasks: list[asyncio.Task] = []
+        # Первая фаза показана при отправке сообщения
+        self._last_text = self.PHASES[0][1]
+        self._last_edit_at = float("-inf")
+        self._pending_text: str | None = None
 
     @classmethod
     @beartype
@@ -80,51 +97,51 @@ class LoadingIndicator:
         return indicator
 
     async def _typing_indicator_loop(self) -> None:
-        """Периодически отправлять typing indicator (каждые 4 сек)."""
+        """Периодически отправлять typing indicator (каждые 5 сек).
+
+        Первая отправка откладывается на TYPING_DELAY: быстрые ответы
+        успевают завершиться без лишнего запроса к Telegram.
+        """
         try:
+            await asyncio.sleep(self.TYPING_DELAY)
             while not self._stopped:
                 await self.user_message.bot.send_chat_action(
                     self.user_message.chat.id,
                     "typing"
                 )
-                await asyncio.sleep(4)  # Обновляем каждые 4 сек
+                # Индикатор в Telegram гаснет примерно через 5 сек
+                await asyncio.sleep(self.TYPING_INTERVAL)
         except asyncio.CancelledError:
             pass  # Задача отменена, это нормально
         except Exception as e:
-            print(f"Error in typing indicator: {e}")
+            logger.debug(f"Error in typing indicator: {e}")
 
     async def _progress_update_loop(self) -> None:
-        """Обновлять текст сообщения в зависимости от времени."""
+        """Обновлять текст сообщения в зависимости от времени.
+
+        Вместо периодического опроса спим ровно до порога следующей фазы:
+        одно пробуждение и одно редактирование на фазу.
+        """
         try:
-            current_phase = 0
-            
-            while not self._stopped:
-                # Вычислить прошедшее время
-                elapsed = (datetime.now() - self.start_time).total_seconds()
-                
-                # Определить текущую фазу
-                new_phase = 0
-                for i, (threshold, _) in enumerate(self.PHASES):
-                    if elapsed >= threshold:
-                        new_phase = i
-                
-                # Обновить текст если фаза изменилась
-                if new_phase != current_phase:
-                    current_phase = new_phase
-                    try:
-                        await self.loading_message.edit_text(
-                            self.PHASES[current_phase][1]
-                        )
-                    except Exception as e:
-                        # Игнорируем ошибки редактирования (например, текст не изменился)
-                        pass
-                
-                await asyncio.sleep(0.8)  # Проверяем каждые 0.8 секунды (более живо)
+            loop = asyncio.get_running_loop()
+            started_at = loop.time()
+
+            # Первая фаза уже показана при отправке сообщения
+            for threshold, text in self.PHASES[1:]:
+                await asyncio.sleep(max(0.0, started_at + threshold - loop.time()))
+                if self._stopped:
+                    return
+
+                try:
+                    await self._edit(text)
+                except Exception as e:
+                    # Игнорируем ошибки редактирования (например, текст не изменился)
+                    pass
                 
         except asyncio.CancelledError:
             pass
         except Exception as e:
-            print(f"Error in progress update: {e}")
+            logger.debug(f"Error in progress update: {e}")
 
     @beartype
     async def update_phase(self, phase: str) -> None:
@@ -137,14 +154,36 @@ class LoadingIndicator:
             return
             
         try:
-            if phase == "timeout":
-                await self.loading_message.edit_text(self.TIMEOUT_MESSAGE)
-            elif phase == "fallback":
-                await self.loading_message.edit_text(self.FALLBACK_MESSAGE)
-            else:
-                await self.loading_message.edit_text(phase)
+            await self._edit(self._PHASE_TEXTS.get(phase, phase))
         except Exception as e:
-            print(f"Error updating phase: {e}")
+            logger.debug(f"Error updating phase: {e}")
+
+    async def _edit(self, text: str) -> None:
+        """Отредактировать сообщение индикатора с учётом лимитов Telegram.
+
+        Повторный текст не отправляется, а между редактированиями выдерживается
+        MIN_EDIT_INTERVAL. Из нескольких обновлений, пришедших за время
+        ожидания, отправляется только последнее.
+
+        Args:
+            text: Новый текст сообщения
+        """
+        if text == self._last_text:
+            return
+
+        self._pending_text = text
+        loop = asyncio.get_running_loop()
+        delay = self._last_edit_at + self.MIN_EDIT_INTERVAL - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+            # Пока ждали, пришёл более свежий текст - его отправит другой вызов
+            if self._pending_text != text or self._stopped:
+                return
+
+        self._pending_text = None
+        self._last_edit_at = loop.time()
+        self._last_text = text
+        await self.loading_message.edit_text(text)
 
     async def stop(self) -> None:
         """Остановить индикатор и удалить сообщение."""
@@ -167,4 +206,4 @@ class LoadingIndicator:
             await self.loading_message.delete()
         except Exception as e:
             # Игнорируем ошибки удаления (сообщение уже могло быть удалено)
-            print(f"Could not delete loading message: {e}")
+            logger.debug(f"Could not delete loading message: {e}")
@@ -0,0 +1,40 @@
+"""Построение регулярных выражений для поиска по наборам слов."""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+
+# Узел префиксного дерева: символ -> дочерний узел ("" отмечает конец слова)
+_Trie = dict[str, "_Trie"]
+
+
+def trie_pattern(keywords: Iterable[str]) -> str:
+    """Собрать регулярное выражение-префиксное дерево для набора слов.
+
+    Ветки дерева начинаются с разных символов, поэтому движок регулярных
+    выражений не перебирает слова по одному, а на каждой позиции идёт
+    по единственному пути. Жадные необязательные группы дают самое длинное
+    слово из набора, начинающееся в текущей позиции.
+
+    Args:
+        keywords: Ключевые слова
+
+    Returns:
+        str: Шаблон регулярного выражения
+    """
+    trie: _Trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: _Trie) -> str:
+        branches = [re.escape(char) + build(child) for char, child in node.items() if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
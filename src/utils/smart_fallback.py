@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import functools
+import re
+from collections.abc import Callable
+
 from beartype import beartype
 
 from src.database.context import Message
@@ -86,6 +90,30 @@ PRICING_QUESTIONS = [
     "оплата",
 ]
 
+# Общие намерения в порядке приоритета. Фразы каждого намерения собраны
+# в одну альтернацию: одна проверка на намерение вместо цикла по фразам
+_GENERAL_INTENT_PATTERNS = tuple(
+    (intent, re.compile("|".join(map(re.escape, phrases))))
+    for intent, phrases in (
+        ("greeting", GREETING_PATTERNS),
+        ("clarification", CLARIFICATION_PATTERNS),
+        ("company_overview", GENERAL_COMPANY_QUESTIONS),
+        ("more_details", DETAIL_REQUESTS),
+        ("pricing_overview", PRICING_QUESTIONS),
+    )
+)
+
+# Ключевые слова тем диалога (в порядке приоритета) для extract_last_topic
+_TOPIC_PATTERNS = tuple(
+    (topic, re.compile("|".join(map(re.escape, keywords))))
+    for topic, keywords in (
+        ("services", ["услуг", "сервис", "делаете", "предлагаете", "занимаетесь"]),
+        ("pricing", ["цен", "стоимость", "прайс", "руб", "стоит"]),
+        ("timing", ["срок", "долго", "быстро", "время", "когда"]),
+        ("contacts", ["контакт", "связь", "телефон", "email"]),
+    )
+)
+
 
 @beartype
 def detect_general_intent(query: str) -> str | None:
@@ -99,25 +127,9 @@ def detect_general_intent(query: str) -> str | None:
     """
     query_lower = query.lower()
 
-    # Приветствия
-    if any(phrase in query_lower for phrase in GREETING_PATTERNS):
-        return "greeting"
-
-    # Уточняющие вопросы
-    if any(phrase in query_lower for phrase in CLARIFICATION_PATTERNS):
-        return "clarification"
-
-    # Вопросы о компании и деятельности
-    if any(phrase in query_lower for phrase in GENERAL_COMPANY_QUESTIONS):
-        return "company_overview"
-
-    # Запрос деталей (подробнее, еще, расскажи больше)
-    if any(phrase in query_lower for phrase in DETAIL_REQUESTS):
-        return "more_details"
-
-    # Вопросы о ценах (общий обзор)
-    if any(phrase in query_lower for phrase in PRICING_QUESTIONS):
-        return "pricing_overview"
+    for intent, pattern in _GENERAL_INTENT_PATTERNS:
+        if pattern.search(query_lower):
+            return intent
 
     return None
 
@@ -166,6 +178,29 @@ def generate_fallback_response(
     return None
 
 
+def _per_knowledge_base(
+    build: Callable[[KnowledgeBase], str],
+) -> Callable[[KnowledgeBase], str]:
+    """Кэшировать сформатированный ответ для версии базы знаний.
+
+    База знаний не меняется после загрузки, поэтому ответ строится один раз
+    на версию (KnowledgeBase.version). Хранится только последняя версия:
+    старые базы после перезагрузки больше не используются.
+    """
+    responses: dict[int, str] = {}
+
+    @functools.wraps(build)
+    def cached(kb: KnowledgeBase) -> str:
+        response = responses.get(kb.version)
+        if response is None:
+            responses.clear()
+            response = responses[kb.version] = build(kb)
+        return response
+
+    return cached
+
+
+@_per_knowledge_base
 @beartype
 def format_greeting_response(kb: KnowledgeBase) -> str:
     """Дружелюбный ответ на приветствие.
@@ -189,6 +224,7 @@ def format_greeting_response(kb: KnowledgeBase) -> str:
 Просто спросите меня о чем угодно!"""
 
 
+@_per_knowledge_base
 @beartype
 def format_company_overview(kb: KnowledgeBase) -> str:
     """Сформатировать подробный ответ о компании и услугах.
@@ -216,6 +252,7 @@ def format_company_overview(kb: KnowledgeBase) -> str:
 Что вас интересует больше всего? Могу рассказать подробнее о любом направлении или обсудим ваш проект?"""
 
 
+@_per_knowledge_base
 @beartype
 def format_services_details(kb: KnowledgeBase) -> str:
     """Сформатировать детальное описание всех услуг.
@@ -246,6 +283,7 @@ def format_services_details(kb: KnowledgeBase) -> str:
 Какая услуга вас заинтересовала больше всего? Или хотите обсудить ваш проект подробнее?"""
 
 
+@_per_knowledge_base
 @beartype
 def format_pricing_overview(kb: KnowledgeBase) -> str:
     """Сформатировать общий обзор цен.
@@ -288,17 +326,10 @@ def extract_last_topic(conversation_history: list[Message]) -> str | None:
     # Анализируем последние 2-3 сообщения
     recent = conversation_history[-3:]
 
-    topics = {
-        "services": ["услуг", "сервис", "делаете", "предлагаете", "занимаетесь"],
-        "pricing": ["цен", "стоимость", "прайс", "руб", "стоит"],
-        "timing": ["срок", "долго", "быстро", "время", "когда"],
-        "contacts": ["контакт", "связь", "телефон", "email"],
-    }
-
     for msg in reversed(recent):
         content_lower = msg.content.lower()
-        for topic, keywords in topics.items():
-            if any(kw in content_lower for kw in keywords):
+        for topic, pattern in _TOPIC_PATTERNS:
+            if pattern.search(content_lower):
                 return topic
 
     return None
@@ -3,6 +3,9 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Callable
+
+from src.utils.patterns import trie_pattern
 
 # NOTE: beartype декораторы временно отключены из-за UnicodeEncodeError в Windows
 # from beartype import beartype
@@ -105,6 +108,42 @@ COMMON_ERRORS = {
 }
 
 
+def _word_replacer(replacements: dict[str, str]) -> Callable[[str], str]:
+    """Собрать словарь замен целых слов в один паттерн (без учёта регистра).
+
+    Слова собраны в префиксное дерево: формы с общим началом ("year"/"years")
+    делят одну ветку, и текст сканируется один раз вместо прохода на каждое слово.
+    """
+    pattern = re.compile(rf'\b(?:{trie_pattern(replacements)})\b', re.IGNORECASE)
+
+    def replace(match: re.Match[str]) -> str:
+        word = match.group(0)
+        replacement = replacements.get(word.lower())
+        if replacement is None:
+            # IGNORECASE сопоставляет латинским буквам и некоторые другие ("ı", "ſ")
+            replacement = next(
+                value
+                for key, value in replacements.items()
+                if re.fullmatch(re.escape(key), word, re.IGNORECASE)
+            )
+        return replacement
+
+    return lambda text: pattern.sub(replace, text)
+
+
+_replace_english_words = _word_replacer(ENGLISH_TO_RUSSIAN)
+_replace_common_errors = _word_replacer(COMMON_ERRORS)
+
+_LATIN_RE = re.compile(r'[a-zA-Z]+')
+_WS_RE = re.compile(r'\s+')
+_PUNCT_WS_RE = re.compile(r'\s+([,.!?;:])')
+# Пробельный символ кроме обычного пробела либо пробел перед пробелом/знаком
+_WS_CLEANUP_NEEDED_RE = re.compile(r'[^\S ]| [\s,.!?;:]')
+
+# Знак препинания (. ! ?) + возможные эмодзи/символы после него + пробелы
+_SENTENCE_END_RE = re.compile(r'([.!?])([^\w\s]*)\s+')
+
+
 def filter_english_words(text: str) -> str:
     """Удалить/заменить английские слова в тексте.
     
@@ -117,25 +156,21 @@ def filter_english_words(text: str) -> str:
     if not text:
         return text
     
-    # 1. Замена по словарю (case-insensitive) - только целые слова
-    for eng, rus in ENGLISH_TO_RUSSIAN.items():
-        # Заменяем целые слова, учитывая границы слов
-        pattern = rf'\b{re.escape(eng)}\b'
-        text = re.sub(pattern, rus, text, flags=re.IGNORECASE)
-    
-    # 2. Удаление английских букв вставленных внутрь слов (например "выagain" -> "вы")
-    # Сначала удаляем латинские буквы НЕ окруженные пробелами
-    # Паттерн: латинские буквы окруженные с обеих сторон не-пробелами
-    text = re.sub(r'(?<=[^\s])[a-zA-Z]+(?=[^\s])', '', text)
-    text = re.sub(r'(?<=[^\s])[a-zA-Z]+\s', ' ', text)  # "словоagain " -> "слово "
-    text = re.sub(r'\s[a-zA-Z]+(?=[^\s])', ' ', text)   # " againслово" -> " слово"
-    
-    # 3. Удаление оставшихся полных английских слов (целые слова с границами)
-    text = re.sub(r'\b[a-zA-Z]{2,}\b', '', text)
-    
-    # 4. Очистка множественных пробелов и лишних пробелов
-    text = re.sub(r'\s+', ' ', text)
-    text = re.sub(r'\s+([,.!?;:])', r'\1', text)  # Убрать пробел перед знаками
+    # В большинстве ответов латиницы нет вовсе: тогда шаги 1-2 ничего
+    # не меняют и пропускаются после одного поиска
+    if _LATIN_RE.search(text):
+        # 1. Замена по словарю (case-insensitive) - только целые слова
+        text = _replace_english_words(text)
+        
+        # 2. Удаление всех оставшихся латинских букв одним проходом: и целых слов,
+        # и вставленных внутрь слов (например "выagain" -> "вы")
+        text = _LATIN_RE.sub('', text)
+    
+    # 3. Очистка множественных пробелов и лишних пробелов. Обычно текст уже
+    # чистый: тогда обе замены ничего не меняют, и хватает одного поиска
+    if _WS_CLEANUP_NEEDED_RE.search(text):
+        text = _WS_RE.sub(' ', text)
+        text = _PUNCT_WS_RE.sub(r'\1', text)  # Убрать пробел перед знаками
     text = text.strip()
     
     return text
@@ -154,12 +189,7 @@ def fix_common_errors(text: str) -> str:
         return text
     
     # Замена частых ошибок с использованием границ слов
-    for wrong, correct in COMMON_ERRORS.items():
-        # Используем regex с границами слов для точной замены
-        pattern = rf'\b{re.escape(wrong)}\b'
-        text = re.sub(pattern, correct, text, flags=re.IGNORECASE)
-    
-    return text
+    return _replace_common_errors(text)
 
 
 def format_text_with_line_breaks(text: str) -> str:
@@ -182,12 +212,12 @@ def format_text_with_line_breaks(text: str) -> str:
     # Паттерн: ([.!?]) - знак препинания
     #          ([^\w\s]*) - возможные эмодзи/символы после знака
     #          \s+ - пробелы
-    result = re.sub(r'([.!?])([^\w\s]*)\s+', r'\1\2\n', text)
-    
-    # Убрать лишние пустые строки
-    lines = [line.strip() for line in result.split('\n') if line.strip()]
+    result = _SENTENCE_END_RE.sub(r'\1\2\n', text)
     
-    return '\n'.join(lines)
+    # Убрать лишние пустые строки (strip один раз на строку)
+    return '\n'.join(
+        [stripped for line in result.split('\n') if (stripped := line.strip())]
+    )
 
 
 def clean_text(text: str) -> str:
@@ -3,63 +3,66 @@
 from __future__ import annotations
 
 import json
-import tempfile
+from collections.abc import Callable, Mapping
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any
 
 import pytest
 
 from src.utils.config_loader import BotConfig, ConfigError
 
+# Валидная конфигурация, от которой отталкиваются тесты; заморожена, чтобы
+# тесты не могли изменить её друг для друга
+_BASE_CONFIG: Mapping[str, Mapping[str, Any]] = MappingProxyType({
+    "company": MappingProxyType({"name": "Test Company", "phone": "+7 (999) 123-45-67", "email": "test@test.com", "telegram": "@test"}),
+    "bot": MappingProxyType({"welcome_message": "Привет от {company_name}!", "personality": "test", "sales_strategy": "test", "language": "ru", "max_response_length": 300}),
+    "ai": MappingProxyType({"model": "test", "temperature": 0.5, "max_tokens": 300, "context_messages": 5}),
+    "features": MappingProxyType({"quick_faq": True, "streaming": True, "progress_bar": True, "hints": False, "onboarding_tips": False}),
+    "faq": MappingProxyType({"quick_check_threshold": 0.75, "search_threshold": 0.4, "max_results": 3}),
+})
 
-def test_load_valid_config():
+
+def _config_dict() -> dict[str, dict[str, Any]]:
+    """Изменяемая копия _BASE_CONFIG, пригодная для json.dumps."""
+    return {section: dict(fields) for section, fields in _BASE_CONFIG.items()}
+
+
+@pytest.fixture
+def write_config(tmp_path: Path) -> Callable[..., Path]:
+    """Фабрика файлов конфигурации на основе _BASE_CONFIG.
+
+    Поля секции из аргумента заменяют базовые, None удаляет секцию целиком.
+    """
+    def _write(**sections: dict[str, Any] | None) -> Path:
+        config_data = _config_dict()
+        for section, fields in sections.items():
+            if fields is None:
+                del config_data[section]
+            else:
+                config_data[section].update(fields)
+
+        path = tmp_path / "config.json"
+        path.write_text(json.dumps(config_data), encoding="utf-8")
+        return path
+
+    return _write
+
+
+@pytest.fixture(scope="module")
+def valid_config(tmp_path_factory) -> BotConfig:
+    """Одна загруженная _BASE_CONFIG на модуль для тестов только на чтение."""
+    path = tmp_path_factory.mktemp("config") / "config.json"
+    path.write_text(json.dumps(_config_dict()), encoding="utf-8")
+    return BotConfig(path)
+
+
+def test_load_valid_config(valid_config):
     """Проверка загрузки валидной конфигурации."""
-    config_data = {
-        "company": {
-            "name": "Test Company",
-            "phone": "+7 (999) 123-45-67",
-            "email": "test@example.com",
-            "telegram": "@test_manager"
-        },
-        "bot": {
-            "welcome_message": "Привет от {company_name}!",
-            "personality": "friendly",
-            "sales_strategy": "soft",
-            "language": "ru",
-            "max_response_length": 300
-        },
-        "ai": {
-            "model": "llama3.2:3b",
-            "temperature": 0.5,
-            "max_tokens": 300,
-            "context_messages": 5
-        },
-        "features": {
-            "quick_faq": True,
-            "streaming": True,
-            "progress_bar": True,
-            "hints": False,
-            "onboarding_tips": False
-        },
-        "faq": {
-            "quick_check_threshold": 0.75,
-            "search_threshold": 0.4,
-            "max_results": 3
-        }
-    }
-    
-    # Создать временный файл конфигурации
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as f:
-        json.dump(config_data, f)
-        temp_path = f.name
-    
-    try:
-        config = BotConfig(temp_path)
-        assert config.company_name == "Test Company"
-        assert config.company_phone == "+7 (999) 123-45-67"
-        assert config.ai_temperature == 0.5
-        assert config.ai_max_tokens == 300
-    finally:
-        Path(temp_path).unlink()
+    assert valid_config.company_name == "Test Company"
+    assert valid_config.company_phone == "+7 (999) 123-45-67"
+    assert valid_config.ai_temperature == 0.5
+    assert valid_config.ai_max_tokens == 300
 
 
 def test_load_missing_file():
@@ -68,79 +71,66 @@ def test_load_missing_file():
         BotConfig("nonexistent_config.json")
 
 
-def test_load_invalid_json():
+def test_load_invalid_json(tmp_path):
     """Проверка ошибки при невалидном JSON."""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as f:
-        f.write("{ invalid json")
-        temp_path = f.name
-    
-    try:
-        with pytest.raises(ConfigError, match="Invalid JSON"):
-            BotConfig(temp_path)
-    finally:
-        Path(temp_path).unlink()
-
-
-def test_validation_missing_section():
-    """Проверка валидации отсутствующей секции."""
-    config_data = {
-        "company": {
-            "name": "Test",
-            "phone": "+7",
-            "email": "test@test.com",
-            "telegram": "@test"
-        }
-        # Отсутствует секция "bot"
-    }
-    
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as f:
-        json.dump(config_data, f)
-        temp_path = f.name
-    
-    try:
-        with pytest.raises(ConfigError, match="Missing required section"):
-            BotConfig(temp_path)
-    finally:
-        Path(temp_path).unlink()
-
-
-def test_validation_invalid_temperature():
-    """Проверка валидации температуры AI."""
-    config_data = {
-        "company": {"name": "Test", "phone": "+7", "email": "test@test.com", "telegram": "@test"},
-        "bot": {"welcome_message": "Hi", "personality": "test", "sales_strategy": "test", "language": "ru", "max_response_length": 300},
-        "ai": {"model": "test", "temperature": 1.5, "max_tokens": 300, "context_messages": 5},  # Невалидная температура
-        "features": {"quick_faq": True, "streaming": True, "progress_bar": True, "hints": False, "onboarding_tips": False},
-        "faq": {"quick_check_threshold": 0.75, "search_threshold": 0.4, "max_results": 3}
-    }
-    
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as f:
-        json.dump(config_data, f)
-        temp_path = f.name
-    
-    try:
-        with pytest.raises(ConfigError, match="temperature"):
-            BotConfig(temp_path)
-    finally:
-        Path(temp_path).unlink()
-
-
-def test_welcome_message_formatting():
+    path = tmp_path / "config.json"
+    path.write_bytes(b"{ invalid json")
+
+    with pytest.raises(ConfigError, match="Invalid JSON"):
+        BotConfig(path)
+
+
+@pytest.mark.parametrize(
+    ("sections", "match"),
+    [
+        pytest.param(
+            {"bot": None, "ai": None, "features": None, "faq": None},
+            "Missing required section",
+            id="missing_section",
+        ),
+        pytest.param(
+            {"ai": {"temperature": 1.5}},  # Невалидная температура
+            "temperature",
+            id="invalid_temperature",
+        ),
+    ],
+)
+def test_validation_errors(write_config, sections, match):
+    """Проверка валидации: отсутствующая секция и невалидная температура AI."""
+    path = write_config(**sections)
+
+    with pytest.raises(ConfigError, match=match):
+        BotConfig(path)
+
+
+def test_welcome_message_formatting(valid_config):
     """Проверка форматирования приветственного сообщения."""
-    config_data = {
-        "company": {"name": "Test Company", "phone": "+7", "email": "test@test.com", "telegram": "@test"},
-        "bot": {"welcome_message": "Привет от {company_name}!", "personality": "test", "sales_strategy": "test", "language": "ru", "max_response_length": 300},
-        "ai": {"model": "test", "temperature": 0.5, "max_tokens": 300, "context_messages": 5},
-        "features": {"quick_faq": True, "streaming": True, "progress_bar": True, "hints": False, "onboarding_tips": False},
-        "faq": {"quick_check_threshold": 0.75, "search_threshold": 0.4, "max_results": 3}
-    }
-    
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as f:
-        json.dump(config_data, f)
-        temp_path = f.name
-    
-    try:
-        config = BotConfig(temp_path)
-        assert config.welcome_message == "Привет от Test Company!"
-    finally:
-        Path(temp_path).unlink()
+    assert valid_config.welcome_message == "Привет от Test Company!"
+
+
+def test_config_reloaded_after_file_change(write_config):
+    """Новый BotConfig читает текущее содержимое изменённого файла."""
+    path = write_config(company={"name": "Old Name"})
+    assert BotConfig(path).company_name == "Old Name"
+
+    write_config(company={"name": "New Name"})
+
+    assert BotConfig(path).company_name == "New Name"
+
+
+def test_load_large_config(write_config):
+    """Конфигурация размером около 1 МБ читается и разбирается целиком."""
+    personality = "п" * 1_000_000
+    path = write_config(bot={"personality": personality})
+
+    config = BotConfig(path)
+    assert config.get("bot.personality") == personality
+    assert config.company_name == "Test Company"
+
+
+def test_config_instances_do_not_share_data(write_config):
+    """Изменение данных одного экземпляра не видно в следующем."""
+    path = write_config()
+    BotConfig(path).get("company")["name"] = "Changed"
+
+    assert BotConfig(path).company_name == "Test Company"
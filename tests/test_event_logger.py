@@ -0,0 +1,45 @@
+"""Тесты для пакетной записи событий."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from src.database.connection import close_connections, get_connection
+from src.database.models import init_database
+from src.metrics.event_logger import EventLogger, close_event_writers
+
+
+async def _logged_event_types(db_path: Path, *, close: bool) -> list[str]:
+    """Записать два события подряд и прочитать типы событий из БД."""
+    await init_database(db_path)
+    event_logger = EventLogger(db_path)
+    await event_logger.log_conversation_started(1)
+    await event_logger.log_first_bot_response(1, 120.5)
+    # Даём фоновой задаче взять первое событие из очереди
+    await asyncio.sleep(0)
+
+    if close:
+        await close_event_writers()
+    else:
+        await event_logger.flush()
+
+    try:
+        db = await get_connection(db_path)
+        rows = await db.execute_fetchall("SELECT event_type FROM events ORDER BY id")
+        return [row[0] for row in rows]
+    finally:
+        await close_event_writers()
+        await close_connections()
+
+
+def test_close_writes_event_taken_by_background_task(tmp_path):
+    """Событие, уже взятое фоновой задачей, не теряется при остановке."""
+    event_types = asyncio.run(_logged_event_types(tmp_path / "bot.db", close=True))
+    assert event_types == ["conversation_started", "first_bot_response"]
+
+
+def test_flush_writes_event_taken_by_background_task(tmp_path):
+    """flush() записывает и событие, которое фоновая задача держит до паузы."""
+    event_types = asyncio.run(_logged_event_types(tmp_path / "bot.db", close=False))
+    assert event_types == ["conversation_started", "first_bot_response"]
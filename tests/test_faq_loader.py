@@ -0,0 +1,45 @@
+"""Тесты для загрузчика базы знаний FAQ."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from src.knowledge.faq_loader import FAQItem, FAQLoader
+
+
+def _write_faq(tmp_path: Path, data: dict) -> Path:
+    """Записать FAQ во временный каталог теста."""
+    faq_path = tmp_path / "faq.json"
+    faq_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return faq_path
+
+
+def test_load_faq_with_optional_fields_missing(tmp_path):
+    """Необязательные поля FAQ заполняются значениями по умолчанию."""
+    faq_path = _write_faq(tmp_path, {"faq": [{"question": "Где вы?", "answer": "Онлайн."}]})
+
+    knowledge_base = asyncio.run(FAQLoader(faq_path).load())
+    item = knowledge_base.faq[0]
+    assert item.id == 0
+    assert item.category == "general"
+    assert item.keywords == ()
+    assert knowledge_base.services == []
+
+
+def test_load_faq_missing_required_field(tmp_path):
+    """Отсутствие обязательного поля даёт ValueError."""
+    faq_path = _write_faq(tmp_path, {"faq": [{"question": "Где вы?"}]})
+
+    with pytest.raises(ValueError, match="answer"):
+        asyncio.run(FAQLoader(faq_path).load())
+
+
+def test_faq_item_is_hashable():
+    """Ключевые слова хранятся кортежем, поэтому FAQItem можно класть в set и кэши."""
+    item = FAQItem(question="Где вы?", answer="Онлайн.", category="general", keywords=("офис",))
+    same = FAQItem(question="Где вы?", answer="Онлайн.", category="general", keywords=("офис",))
+    assert {item, same} == {item}
@@ -0,0 +1,91 @@
+"""Тесты для репозитория контекстов воронки с отложенной записью."""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from src.database.connection import close_connections
+from src.database.models import init_database
+from src.funnel.repository import FunnelContextRepository, close_funnel_repositories
+from src.funnel.stages import FunnelContext, FunnelStage
+from src.nlu.slot_extractor import SlotCollection
+
+
+def _context(user_id: int, stage: FunnelStage) -> FunnelContext:
+    """Контекст воронки без слотов."""
+    return FunnelContext(user_id=user_id, current_stage=stage, slots=SlotCollection())
+
+
+@pytest.fixture(scope="module")
+def db_path(tmp_path_factory) -> Path:
+    """Одна БД со схемой на модуль; тесты используют разные user_id."""
+    path = tmp_path_factory.mktemp("funnel") / "bot.db"
+    asyncio.run(init_database(path))
+    return path
+
+
+def test_load_sees_context_while_flush_in_flight(db_path):
+    """Пока пачка пишется, load() возвращает её контекст, а не старую строку БД."""
+    async def scenario() -> FunnelContext | None:
+        try:
+            repository = FunnelContextRepository(db_path)
+            repository.mark_dirty(1, _context(1, FunnelStage.OFFER))
+            flush = asyncio.create_task(repository.flush())
+            await asyncio.sleep(0)  # flush забрал пачку и ждёт БД
+            loaded = await repository.load(1)
+            await flush
+            return loaded
+        finally:
+            await close_connections()
+
+    loaded = asyncio.run(scenario())
+    assert loaded is not None
+    assert loaded.current_stage == FunnelStage.OFFER
+
+
+def test_failed_flush_keeps_batch_without_overwriting_newer(tmp_path):
+    """Неудачная запись возвращает пачку в очередь, новые изменения важнее."""
+    path = tmp_path / "bot.db"
+
+    async def scenario() -> tuple[FunnelContext | None, FunnelContext | None]:
+        try:
+            repository = FunnelContextRepository(path)
+            repository.mark_dirty(1, _context(1, FunnelStage.OFFER))
+            repository.mark_dirty(2, _context(2, FunnelStage.OFFER))
+            flush = asyncio.create_task(repository.flush())
+            await asyncio.sleep(0)
+            repository.mark_dirty(1, _context(1, FunnelStage.CLOSING))
+            # Схемы ещё нет: запись падает на отсутствующей таблице
+            with pytest.raises(sqlite3.OperationalError, match="no such table: funnel_contexts"):
+                await flush
+
+            await init_database(path)
+            await repository.flush()
+            return await repository.load(1), await repository.load(2)
+        finally:
+            await close_connections()
+
+    first, second = asyncio.run(scenario())
+    assert first is not None and first.current_stage == FunnelStage.CLOSING
+    assert second is not None and second.current_stage == FunnelStage.OFFER
+
+
+def test_close_funnel_repositories_writes_pending(db_path):
+    """При остановке изменения запущенных репозиториев попадают в БД."""
+    async def scenario() -> FunnelContext | None:
+        try:
+            repository = FunnelContextRepository(db_path, flush_interval=60.0)
+            repository.start()
+            repository.mark_dirty(3, _context(3, FunnelStage.SUPPORT))
+            await close_funnel_repositories()
+            return await FunnelContextRepository(db_path).load(3)
+        finally:
+            await close_connections()
+
+    loaded = asyncio.run(scenario())
+    assert loaded is not None
+    assert loaded.current_stage == FunnelStage.SUPPORT
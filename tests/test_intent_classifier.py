@@ -0,0 +1,37 @@
+"""Тесты для классификатора интентов."""
+
+from __future__ import annotations
+
+from src.nlu.intent_classifier import IntentClassifier, IntentPriority
+
+
+def test_classify_counts_overlapping_keywords():
+    """Ключевые слова, начинающиеся в одной позиции, учитываются все."""
+    classifier = IntentClassifier()
+
+    # "вернуть" и "вернуть деньги" начинаются в одной позиции
+    intent = classifier.classify("вернуть деньги")
+
+    assert intent.name == "refund_request"
+    assert intent.priority == IntentPriority.COMPLAINTS
+    assert intent.confidence == 2 / 7 + 0.3
+
+
+def test_classify_respects_priority_cascade():
+    """Интент с более высоким приоритетом побеждает независимо от порядка слов."""
+    classifier = IntentClassifier()
+
+    intent = classifier.classify("привет, это мошенничество")
+
+    assert intent.name == "abuse"
+    assert intent.group == "security"
+
+
+def test_classify_default_intent():
+    """Без совпадений возвращается интент general."""
+    classifier = IntentClassifier()
+
+    intent = classifier.classify("спасибо за ответ")
+
+    assert intent.name == "general"
+    assert intent.confidence == 0.5
@@ -4,8 +4,55 @@ from __future__ import annotations
 
 import pytest
 
-from src.knowledge.faq_loader import FAQItem
-from src.knowledge.search import calculate_relevance, normalize_text
+from src.knowledge.faq_loader import CommonPhrases, Company, FAQItem, KnowledgeBase
+from src.knowledge.search import (
+    _prepare_query,
+    calculate_relevance,
+    calculate_relevance_batch,
+    normalize_text,
+    search_faq,
+)
+
+
+# Элементы FAQ для тестов релевантности (FAQItem заморожен, тесты их не меняют)
+_FAQ_SERVICES = FAQItem(
+    question="Какие у вас услуги?",
+    answer="У нас три вида услуг.",
+    keywords=("услуги", "сервисы"),
+    category="общее"
+)
+_FAQ_CONSULTATION = FAQItem(
+    question="Сколько стоит консультация?",
+    answer="Консультация стоит от 5000 руб.",
+    keywords=("цена", "стоимость"),
+    category="цены"
+)
+_FAQ_PRICE = FAQItem(
+    question="Сколько стоит?",
+    answer="Цены от 5000 руб.",
+    keywords=("цена", "стоимость", "расценки"),
+    category="цены"
+)
+_FAQ_CONTACTS = FAQItem(
+    question="Как с вами связаться?",
+    answer="Позвоните нам.",
+    keywords=("контакты",),
+    category="контакты"
+)
+
+
+def _make_knowledge_base(faq: list[FAQItem]) -> KnowledgeBase:
+    """Собрать минимальную базу знаний для тестов поиска."""
+    return KnowledgeBase(
+        company=Company(
+            name="Тест", description="", website="", phone="", email="", telegram=""
+        ),
+        services=[],
+        faq=faq,
+        phrases=CommonPhrases(
+            greeting="", closing="", not_found="", error="", thinking=""
+        ),
+    )
 
 
 def test_normalize_text():
@@ -20,70 +67,50 @@ def test_normalize_text():
     assert result == "привет мир"
 
 
+@pytest.mark.parametrize(
+    "text",
+    [
+        pytest.param("", id="empty"),
+        pytest.param(" \t\n«Цена» — 5 000₽?! ", id="punctuation_only_edges"),
+        pytest.param("İstanbul ÄÖÜ ß ǅ", id="unicode_case"),
+        pytest.param("Сколько, стоит?! hello_world " * 4_000, id="large"),
+    ],
+)
+def test_normalize_text_idempotent(text):
+    """Повторная нормализация ничего не меняет, в том числе на длинном вводе."""
+    normalized = normalize_text(text)
+    assert normalize_text(normalized) == normalized
+
+
 def test_calculate_relevance_exact_match():
     """Проверка точного совпадения вопроса."""
-    faq = FAQItem(
-        question="Какие у вас услуги?",
-        answer="У нас три вида услуг.",
-        keywords=["услуги", "сервисы"],
-        category="общее"
-    )
-    
-    score = calculate_relevance("Какие у вас услуги?", faq)
+    score = calculate_relevance("Какие у вас услуги?", _FAQ_SERVICES)
     assert score >= 0.8  # Высокая релевантность
 
 
 def test_calculate_relevance_partial_match():
     """Проверка частичного совпадения."""
-    faq = FAQItem(
-        question="Сколько стоит консультация?",
-        answer="Консультация стоит от 5000 руб.",
-        keywords=["цена", "стоимость"],
-        category="цены"
-    )
-    
-    score = calculate_relevance("консультация", faq)
+    score = calculate_relevance("консультация онлайн", _FAQ_CONSULTATION)
     assert score > 0.0
     assert score < 1.0
 
 
 def test_calculate_relevance_no_match():
     """Проверка отсутствия совпадения."""
-    faq = FAQItem(
-        question="Какие у вас услуги?",
-        answer="У нас три вида услуг.",
-        keywords=["услуги"],
-        category="общее"
-    )
-    
-    score = calculate_relevance("погода сегодня", faq)
+    score = calculate_relevance("погода сегодня", _FAQ_SERVICES)
     assert score < 0.3  # Низкая релевантность
 
 
 def test_calculate_relevance_keyword_match():
     """Проверка совпадения по ключевым словам."""
-    faq = FAQItem(
-        question="Сколько стоит?",
-        answer="Цены от 5000 руб.",
-        keywords=["цена", "стоимость", "расценки"],
-        category="цены"
-    )
-    
-    score = calculate_relevance("какая цена", faq)
+    score = calculate_relevance("какая цена", _FAQ_PRICE)
     assert score >= 0.7  # Высокая релевантность благодаря ключевому слову
 
 
 def test_calculate_relevance_stop_words():
     """Проверка фильтрации стоп-слов."""
-    faq = FAQItem(
-        question="Как с вами связаться?",
-        answer="Позвоните нам.",
-        keywords=["контакты"],
-        category="контакты"
-    )
-    
     # Запрос только из стоп-слов
-    score = calculate_relevance("как где что", faq)
+    score = calculate_relevance("как где что", _FAQ_CONTACTS)
     assert score == 0.0  # Нет значимых слов
 
 
@@ -92,7 +119,7 @@ def test_calculate_relevance_case_insensitive():
     faq = FAQItem(
         question="Какие услуги?",
         answer="Три вида услуг.",
-        keywords=["УСЛУГИ"],
+        keywords=("УСЛУГИ",),
         category="общее"
     )
     
@@ -102,3 +129,77 @@ def test_calculate_relevance_case_insensitive():
     
     # Все варианты должны давать одинаковый результат
     assert score1 == score2 == score3
+
+
+@pytest.mark.parametrize(
+    "query", ["Какие у вас услуги?", "какая цена консультации", "как где что", ""]
+)
+def test_calculate_relevance_batch_matches_single(query):
+    """Пакетный расчёт совпадает с поэлементным calculate_relevance."""
+    faqs = [_FAQ_SERVICES, _FAQ_CONSULTATION, _FAQ_PRICE, _FAQ_CONTACTS]
+
+    assert calculate_relevance_batch(query, faqs) == [
+        calculate_relevance(query, faq) for faq in faqs
+    ]
+
+
+def test_faq_item_precomputed_tokens():
+    """Проверка предвычисленных нормализованных форм FAQ."""
+    faq = FAQItem(
+        question="Сколько стоит доставка?",
+        answer="Доставка бесплатная!",
+        keywords=("Цена доставки", "тариф"),
+        category="доставка"
+    )
+
+    assert faq.question_norm == "сколько стоит доставка"
+    assert faq.question_word_set == frozenset({"сколько", "стоит", "доставка"})
+    assert faq.keyword_norms == ("цена доставки", "тариф")
+    assert faq.keyword_word_sets == (frozenset({"цена", "доставки"}), frozenset({"тариф"}))
+    assert faq.answer_word_set == frozenset({"доставка", "бесплатная"})
+
+
+def test_search_faq_uses_index_candidates():
+    """Поиск по индексу находит совпадения по подстроке вопроса и ключевой фразе."""
+    services = FAQItem(
+        question="Какие у вас услуги?",
+        answer="У нас три вида услуг.",
+        keywords=("список услуг",),
+        category="общее"
+    )
+    location = FAQItem(
+        question="Где вы находитесь?",
+        answer="Работаем удалённо.",
+        keywords=("где вы", "офис"),
+        category="контакты"
+    )
+    kb = _make_knowledge_base([services, location])
+
+    assert kb.faq_index["услуг"] == (0,)
+    assert search_faq("услуг", kb) == [services]
+    assert search_faq("где вы сейчас", kb) == [location]
+    assert search_faq("погода сегодня", kb) == []
+
+
+def test_search_faq_stop_words_only():
+    """Запрос только из стоп-слов не даёт результатов."""
+    faq = FAQItem(
+        question="Как с вами связаться?",
+        answer="Позвоните нам.",
+        keywords=("как",),
+        category="контакты"
+    )
+    kb = _make_knowledge_base([faq])
+
+    assert search_faq("как где что", kb) == []
+    assert search_faq("   ", kb) == []
+
+
+def test_prepare_query_cached():
+    """Повторный запрос берётся из кэша, а не нормализуется заново."""
+    _prepare_query.cache_clear()
+    assert calculate_relevance("Какие услуги?", _FAQ_SERVICES) > 0
+    search_faq("Какие услуги?", _make_knowledge_base([_FAQ_SERVICES]))
+
+    info = _prepare_query.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
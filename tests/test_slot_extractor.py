@@ -0,0 +1,33 @@
+"""Тесты для экстрактора слотов."""
+
+from __future__ import annotations
+
+from src.nlu.slot_extractor import SlotExtractor
+
+
+def test_validate_contact_accepts_phone_and_email():
+    """Корректные телефон и email проходят валидацию."""
+    extractor = SlotExtractor()
+
+    assert extractor.validate_slot("contact", "+7 (999) 123-45-67") == (True, "")
+    assert extractor.validate_slot("contact", "89991234567") == (True, "")
+    assert extractor.validate_slot("contact", "user.name@example.com") == (True, "")
+
+
+def test_validate_contact_rejects_trailing_garbage():
+    """Контакт с лишними символами после номера или адреса не валиден."""
+    extractor = SlotExtractor()
+
+    valid, error = extractor.validate_slot("contact", "+79991234567extra")
+    assert not valid
+    assert error == "Укажите корректный телефон или email"
+
+    valid, _ = extractor.validate_slot("contact", "user@example.com, звоните")
+    assert not valid
+
+
+def test_extract_order_id_ignores_case():
+    """Номер заказа извлекается независимо от регистра."""
+    collection = SlotExtractor().extract("ЗАКАЗ № 4521 не пришёл")
+
+    assert collection.get_value("order_id") == "4521"
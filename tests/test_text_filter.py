@@ -27,6 +27,17 @@ def test_filter_english_words_removes_mixed():
     assert "said" not in result.lower()
 
 
+def test_filter_english_words_removes_single_letters_and_edges():
+    """Одиночные латинские буквы и латиница на краях строки тоже удаляются."""
+    assert filter_english_words("Вариант A подходит") == "Вариант подходит"
+    assert filter_english_words("abcслово и словоxyz") == "слово и слово"
+
+
+def test_filter_english_words_large_input():
+    """Длинная латинская последовательность удаляется целиком."""
+    assert filter_english_words("x" * 10_000 + " привет") == "привет"
+
+
 def test_fix_common_errors():
     """Проверка исправления частых ошибок."""
     text = "реагировка специалисти"
@@ -35,6 +46,11 @@ def test_fix_common_errors():
     assert "специалисты" in result
 
 
+def test_fix_common_errors_whole_words_only():
+    """Ошибки заменяются без учёта регистра и только целыми словами."""
+    assert fix_common_errors("Угмами и угм, но не угмаха") == "услугами и услуг, но не угмаха"
+
+
 def test_clean_text_integration():
     """Интеграционный тест очистки текста."""
     text = "Привет! hello Это тест.\n\nС english словами."
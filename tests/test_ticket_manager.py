@@ -0,0 +1,47 @@
+"""Тесты для менеджера тикетов с пакетной записью."""
+
+from __future__ import annotations
+
+import asyncio
+
+from src.database.models import init_database
+from src.handoff.ticket_manager import TicketManager, TicketType
+from src.nlu.slot_extractor import SlotCollection
+
+
+def test_close_during_batch_write_saves_ticket(tmp_path, monkeypatch):
+    """close() во время записи пачки дожидается её: тикет сохранён, create_ticket завершается."""
+    monkeypatch.setattr(TicketManager, "EXPORT_DIR", tmp_path / "tickets")
+    db_path = tmp_path / "bot.db"
+
+    async def scenario() -> tuple[int, bool]:
+        await init_database(db_path)
+        manager = TicketManager(db_path)
+        await manager.start()
+
+        # Медленная вставка: close() приходит, когда пачка уже забрана из очереди
+        assert manager._db is not None
+        execute = manager._db.execute
+
+        write_started = asyncio.Event()
+
+        async def slow_execute(*args, **kwargs):
+            write_started.set()
+            await asyncio.sleep(0.05)
+            return await execute(*args, **kwargs)
+
+        monkeypatch.setattr(manager._db, "execute", slow_execute)
+
+        create = asyncio.create_task(
+            manager.create_ticket(TicketType.REFUND, 1, "@user", "Возврат", SlotCollection(), [])
+        )
+        await write_started.wait()
+        await manager.close()
+
+        ticket = await asyncio.wait_for(create, timeout=1)
+        check = TicketManager(db_path)
+        return ticket.ticket_id, await check.get_ticket(ticket.ticket_id) is not None
+
+    ticket_id, stored = asyncio.run(scenario())
+    assert ticket_id > 0
+    assert stored